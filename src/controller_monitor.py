@@ -5,13 +5,16 @@ monitoraggio input real-time con focus sulla DURATA delle pressioni.
 Traccia press/release per misurare quanto tempo un tasto resta premuto.
 """
 
+import ctypes
+import sys
 import threading
 import time
 import logging
-from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional, Callable
 
+import numpy as np
+
 try:
     import inputs
 except ImportError:
@@ -19,17 +22,91 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# XInput nativo (solo Windows): polling diretto dello stato del pad
+_xinput = None
+# winmm per la risoluzione del timer di sistema: prima di Python 3.11
+# time.sleep(0.001) su Windows dura un tick di sistema (~15.6 ms)
+_winmm = None
+if sys.platform == "win32":
+    for _dll_name in ("xinput1_4", "xinput1_3", "xinput9_1_0"):
+        try:
+            _xinput = ctypes.WinDLL(_dll_name)
+            break
+        except OSError:
+            continue
+    try:
+        _winmm = ctypes.WinDLL("winmm")
+    except OSError:
+        _winmm = None
+
+_XINPUT_ERROR_SUCCESS = 0
+_XINPUT_MAX_USERS = 4
+
+
+class _XInputGamepad(ctypes.Structure):
+    _fields_ = [
+        ("wButtons", ctypes.c_ushort),
+        ("bLeftTrigger", ctypes.c_ubyte),
+        ("bRightTrigger", ctypes.c_ubyte),
+        ("sThumbLX", ctypes.c_short),
+        ("sThumbLY", ctypes.c_short),
+        ("sThumbRX", ctypes.c_short),
+        ("sThumbRY", ctypes.c_short),
+    ]
+
+
+class _XInputState(ctypes.Structure):
+    _fields_ = [
+        ("dwPacketNumber", ctypes.c_ulong),
+        ("Gamepad", _XInputGamepad),
+    ]
+
+
+class _XInputEvent:
+    """Evento sintetico con la stessa interfaccia (code/state) di inputs."""
+    __slots__ = ("code", "state")
+
+    def __init__(self, code: str, state: int):
+        self.code = code
+        self.state = state
+
+
+# Bit di wButtons XInput -> codice evento inputs equivalente
+_XINPUT_BUTTON_CODES = (
+    (0x1000, "BTN_SOUTH"),
+    (0x2000, "BTN_EAST"),
+    (0x4000, "BTN_WEST"),
+    (0x8000, "BTN_NORTH"),
+    (0x0100, "BTN_TL"),
+    (0x0200, "BTN_TR"),
+    (0x0040, "BTN_THUMBL"),
+    (0x0080, "BTN_THUMBR"),
+    (0x0010, "BTN_START"),
+    (0x0020, "BTN_SELECT"),
+)
+_XINPUT_DPAD_UP = 0x0001
+_XINPUT_DPAD_DOWN = 0x0002
+_XINPUT_DPAD_LEFT = 0x0004
+_XINPUT_DPAD_RIGHT = 0x0008
+
+# Capacita' iniziale dello storico durate (raddoppia quando pieno)
+HISTORY_INITIAL_SIZE = 4096
+
+
+@dataclass(slots=True)
 class PressEvent:
-    """Singola pressione completa (press + release)."""
+    """Singola pressione completa (press + release).
+
+    I timestamp sono in ns da time.perf_counter_ns() (monotonico).
+    Le istanze sono condivise tra log e coda GUI: non vanno modificate.
+    """
     button: str
-    press_time: float
-    release_time: float
+    press_time: int
+    release_time: int
     duration_ms: float
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStats:
     """Statistiche della sessione corrente."""
     start_time: float = 0.0
@@ -38,9 +115,59 @@ class SessionStats:
     min_duration_ms: float = float("inf")
     max_duration_ms: float = 0.0
     last_duration_ms: float = 0.0
+    # Media su tutte le pressioni della sessione, aggiornata ad ogni pressione
+    avg_duration_ms: float = 0.0
     threshold_successes: int = 0
     below_threshold: bool = False
-    durations_history: list = field(default_factory=list)
+    # Storico durate in array paralleli (SoA): tempo rilascio, durata, id pulsante
+    _hist_times: np.ndarray = field(
+        default_factory=lambda: np.empty(HISTORY_INITIAL_SIZE, dtype=np.float64),
+        repr=False,
+    )
+    _hist_durations: np.ndarray = field(
+        default_factory=lambda: np.empty(HISTORY_INITIAL_SIZE, dtype=np.float32),
+        repr=False,
+    )
+    _hist_button_ids: np.ndarray = field(
+        default_factory=lambda: np.empty(HISTORY_INITIAL_SIZE, dtype=np.uint8),
+        repr=False,
+    )
+    _hist_idx: int = 0
+
+    def append_history(self, release_time: float, duration_ms: float, button_id: int) -> None:
+        """Aggiunge una pressione allo storico, raddoppiando gli array se pieni.
+
+        Args:
+            release_time: timestamp del rilascio in ns (perf_counter_ns)
+            duration_ms: durata in millisecondi
+            button_id: indice del pulsante in ControllerMonitor.BUTTON_IDS
+        """
+        i = self._hist_idx
+        if i == self._hist_times.shape[0]:
+            size = i * 2
+            self._hist_times = np.resize(self._hist_times, size)
+            self._hist_durations = np.resize(self._hist_durations, size)
+            self._hist_button_ids = np.resize(self._hist_button_ids, size)
+
+        self._hist_times[i] = release_time
+        self._hist_durations[i] = duration_ms
+        self._hist_button_ids[i] = button_id
+        self._hist_idx = i + 1
+
+    @property
+    def history_times(self) -> np.ndarray:
+        """Timestamps di rilascio registrati (vista contigua)."""
+        return self._hist_times[:self._hist_idx]
+
+    @property
+    def history_durations(self) -> np.ndarray:
+        """Durate registrate in ms (vista contigua)."""
+        return self._hist_durations[:self._hist_idx]
+
+    @property
+    def history_button_ids(self) -> np.ndarray:
+        """Id pulsante di ogni pressione registrata (vista contigua)."""
+        return self._hist_button_ids[:self._hist_idx]
 
 
 class ControllerMonitor:
@@ -76,6 +203,29 @@ class ControllerMonitor:
         "ABS_HAT0Y": "D-Pad Y",
     }
 
+    # Tutti i nomi pulsante, nell'ordine mostrato dalla GUI
+    AVAILABLE_BUTTONS = (
+        tuple(BUTTON_MAP.values())
+        + tuple(TRIGGER_MAP.values())
+        + tuple(DPAD_MAP.values())
+    )
+
+    # Indice compatto di ogni pulsante per lo storico SoA
+    BUTTON_IDS = {name: i for i, name in enumerate(AVAILABLE_BUTTONS)}
+    _ALL_BUTTONS_MASK = (1 << len(AVAILABLE_BUTTONS)) - 1
+
+    # Tipi di input nella tabella di dispatch
+    _KIND_BUTTON = 0
+    _KIND_TRIGGER = 1
+    _KIND_DPAD = 2
+
+    # Capacita' massima del log pressioni in memoria
+    PRESS_LOG_SIZE = 10000
+    # Numero di timestamp di poll conservati
+    POLL_RING_SIZE = 2000
+    # Intervallo tra due letture XInput (1 kHz)
+    XINPUT_POLL_INTERVAL_S = 0.001
+
     def __init__(self, threshold_ms: float = 50.0):
         """Inizializza il monitor.
 
@@ -86,14 +236,24 @@ class ControllerMonitor:
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self._lock = threading.Lock()
-
-        # Stato corrente di ogni pulsante (timestamp press o None)
-        self._button_press_times: dict[str, float] = {}
-        # Storico pressioni complete
-        self._press_log: list[PressEvent] = []
-        # Timestamps polling reale dal thread input
-        self._poll_timestamps: deque = deque(maxlen=2000)
+
+        # Stato corrente di ogni pulsante (timestamp press in ns o None)
+        self._button_press_times: dict[str, int] = {}
+        # Storico pressioni complete: ring buffer a capacita' fissa,
+        # single-producer (thread monitor) / single-consumer (GUI) senza lock.
+        # _write_idx e' monotono e viene pubblicato dopo la scrittura dello slot.
+        self._press_ring: list[Optional[PressEvent]] = [None] * self.PRESS_LOG_SIZE
+        self._write_idx = 0
+        # Somma durate di tutta la sessione per la media in O(1)
+        # (non limitata al ring: la media salvata nel CSV e' di sessione)
+        self._sum_duration_ms: float = 0.0
+        # Timestamps polling reale dal thread input (ns, perf_counter_ns)
+        # in un ring buffer preallocato: scritto solo dal thread monitor
+        self._poll_ring = np.empty(self.POLL_RING_SIZE, dtype=np.int64)
+        self._poll_head = 0
+        self._poll_count = 0
+        # (timestamp ultimo poll, polling rate, stats latenza): vedi _poll_snapshot
+        self._poll_snapshot_cache: Optional[tuple[int, float, dict]] = None
         # Callback per notifiche alla GUI
         self._on_press_complete: Optional[Callable] = None
 
@@ -101,15 +261,45 @@ class ControllerMonitor:
         self.controller_name: str = "Nessun controller"
         self.connection_type: str = "Sconosciuto"
         self._gamepad = None
+        self._session_start_ns = 0
+        # Indice utente XInput del pad (None = backend inputs)
+        self._xinput_index: Optional[int] = None
 
         # Soglia trigger analogici per considerarli "premuti"
         self._trigger_threshold = 128
-        self._trigger_states: dict[str, bool] = {}
-        # Stato D-Pad per tracciare release
-        self._dpad_states: dict[str, bool] = {}
+        # Tabella di dispatch: codice evento -> (nome, tipo, soglia, bit stato, bit pulsante)
+        self._code_table = self._build_code_table()
+        # Stato premuto di trigger e D-Pad, un bit per codice
+        self._state_bits = 0
 
         # Pulsante attualmente monitorato (None = tutti)
         self.monitored_button: Optional[str] = None
+        # Bit (1 << BUTTON_IDS) dei pulsanti che passano il filtro
+        self._monitored_mask = self._ALL_BUTTONS_MASK
+
+    def _build_code_table(self) -> dict[str, tuple[str, int, int, int, int]]:
+        """Costruisce la tabella di dispatch degli eventi.
+
+        Returns:
+            dict codice evento -> (nome pulsante, tipo, soglia, maschera stato,
+            bit pulsante); soglia e maschera stato valgono solo per trigger
+            e D-Pad, il bit pulsante serve al filtro del pulsante monitorato
+        """
+        ids = self.BUTTON_IDS
+        table: dict[str, tuple[str, int, int, int, int]] = {}
+        for code, name in self.BUTTON_MAP.items():
+            table[code] = (name, self._KIND_BUTTON, 0, 0, 1 << ids[name])
+
+        bit = 0
+        for code, name in self.TRIGGER_MAP.items():
+            table[code] = (name, self._KIND_TRIGGER, self._trigger_threshold,
+                           1 << bit, 1 << ids[name])
+            bit += 1
+        # D-Pad: premuto per qualsiasi valore diverso da 0 (-1 o 1)
+        for code, name in self.DPAD_MAP.items():
+            table[code] = (name, self._KIND_DPAD, 0, 1 << bit, 1 << ids[name])
+            bit += 1
+        return table
 
     def detect_controller(self) -> bool:
         """Rileva il primo controller disponibile.
@@ -131,6 +321,7 @@ class ControllerMonitor:
             self._gamepad = gamepads[0]
             self.controller_name = self._gamepad.name or "Controller sconosciuto"
             self._detect_connection_type()
+            self._xinput_index = self._find_xinput_index(self._gamepad)
 
             logger.info("Controller rilevato: %s (%s)",
                         self.controller_name, self.connection_type)
@@ -140,6 +331,39 @@ class ControllerMonitor:
             logger.error("Errore rilevamento controller: %s", e)
             return False
 
+    @staticmethod
+    def _find_xinput_index(gamepad) -> Optional[int]:
+        """Cerca lo slot XInput dello stesso pad rilevato da inputs (solo Windows).
+
+        Su Windows inputs enumera i pad XInput e GamePad.get_number()
+        restituisce il loro indice utente: se disponibile si usa quello. Altrimenti XInput non espone
+        nomi di dispositivo per abbinare il pad, quindi lo si usa solo se c'e'
+        un unico pad collegato; con piu' pad non abbinabili si resta su
+        inputs, cosi' nome e tipo connessione mostrati restano coerenti.
+
+        Args:
+            gamepad: dispositivo rilevato da inputs
+
+        Returns:
+            indice utente XInput o None per usare la libreria inputs
+        """
+        if _xinput is None:
+            return None
+
+        state = _XInputState()
+        connected = [
+            index for index in range(_XINPUT_MAX_USERS)
+            if _xinput.XInputGetState(index, ctypes.byref(state)) == _XINPUT_ERROR_SUCCESS
+        ]
+
+        get_number = getattr(gamepad, "get_number", None)
+        device_number = get_number() if get_number is not None else None
+        if isinstance(device_number, int):
+            return device_number if device_number in connected else None
+        if len(connected) == 1:
+            return connected[0]
+        return None
+
     def _detect_connection_type(self) -> None:
         """Tenta di determinare il tipo di connessione (USB/Bluetooth)."""
         if self._gamepad is None:
@@ -170,6 +394,12 @@ class ControllerMonitor:
             button: nome pulsante (es. "A", "B") o None per tutti
         """
         self.monitored_button = button
+        if not button:
+            self._monitored_mask = self._ALL_BUTTONS_MASK
+        else:
+            # Nome sconosciuto: nessun pulsante passa, come il confronto per nome
+            button_id = self.BUTTON_IDS.get(button)
+            self._monitored_mask = 0 if button_id is None else 1 << button_id
 
     def start(self) -> bool:
         """Avvia il monitoraggio in un thread separato.
@@ -184,12 +414,18 @@ class ControllerMonitor:
             return False
 
         self._running = True
+        # start_time resta wall-clock per la leggibilita', le durate usano
+        # il contatore monotonico
         self.stats = SessionStats(start_time=time.time())
+        self._session_start_ns = time.perf_counter_ns()
         self._button_press_times.clear()
-        self._press_log.clear()
-        self._poll_timestamps.clear()
-        self._trigger_states.clear()
-        self._dpad_states.clear()
+        self._press_ring = [None] * self.PRESS_LOG_SIZE
+        self._write_idx = 0
+        self._sum_duration_ms = 0.0
+        self._poll_head = 0
+        self._poll_count = 0
+        self._poll_snapshot_cache = None
+        self._state_bits = 0
 
         self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._thread.start()
@@ -216,15 +452,119 @@ class ControllerMonitor:
         return self._running
 
     def _monitor_loop(self) -> None:
-        """Loop principale di monitoraggio (eseguito in thread separato)."""
+        """Loop principale di monitoraggio (eseguito in thread separato).
+
+        Su Windows con un pad XInput usa il polling nativo a 1 kHz,
+        altrimenti la libreria inputs.
+        """
+        if self._xinput_index is not None:
+            logger.info("Backend input: XInput nativo (utente %d)", self._xinput_index)
+            # Timer di sistema a 1 ms per la durata del polling: senza, su
+            # Python < 3.11 la sleep del loop scende a ~64 Hz
+            if _winmm is not None:
+                _winmm.timeBeginPeriod(1)
+            try:
+                self._xinput_loop(self._xinput_index)
+            finally:
+                if _winmm is not None:
+                    _winmm.timeEndPeriod(1)
+        else:
+            self._inputs_loop()
+
+    def _xinput_loop(self, user_index: int) -> None:
+        """Polling diretto di XInputGetState.
+
+        Lo stato viene letto ogni XINPUT_POLL_INTERVAL_S; solo quando
+        dwPacketNumber cambia si confronta con lo stato precedente e si
+        generano eventi con gli stessi codici della libreria inputs.
+
+        Args:
+            user_index: indice utente XInput del pad
+        """
+        get_state = _xinput.XInputGetState
+        state = _XInputState()
+        state_ref = ctypes.byref(state)
+        pad = state.Gamepad
+        process = self._process_event
+        poll_ring = self._poll_ring
+        ring_size = self.POLL_RING_SIZE
+        interval = self.XINPUT_POLL_INTERVAL_S
+
+        last_packet = None
+        last_buttons = 0
+        last_lt = 0
+        last_rt = 0
+        last_hat_x = 0
+        last_hat_y = 0
+
+        while self._running:
+            if get_state(user_index, state_ref) != _XINPUT_ERROR_SUCCESS:
+                logger.warning("Controller scollegato")
+                self._running = False
+                break
+
+            if state.dwPacketNumber == last_packet:
+                time.sleep(interval)
+                continue
+            last_packet = state.dwPacketNumber
+
+            now = time.perf_counter_ns()
+            head = self._poll_head
+            poll_ring[head] = now
+            self._poll_head = (head + 1) % ring_size
+            if self._poll_count < ring_size:
+                self._poll_count += 1
+
+            buttons = pad.wButtons
+            changed = buttons ^ last_buttons
+            if changed:
+                for mask, code in _XINPUT_BUTTON_CODES:
+                    if changed & mask:
+                        process(_XInputEvent(code, 1 if buttons & mask else 0), now)
+
+                hat_x = ((buttons & _XINPUT_DPAD_RIGHT) != 0) - ((buttons & _XINPUT_DPAD_LEFT) != 0)
+                hat_y = ((buttons & _XINPUT_DPAD_DOWN) != 0) - ((buttons & _XINPUT_DPAD_UP) != 0)
+                if hat_x != last_hat_x:
+                    process(_XInputEvent("ABS_HAT0X", hat_x), now)
+                    last_hat_x = hat_x
+                if hat_y != last_hat_y:
+                    process(_XInputEvent("ABS_HAT0Y", hat_y), now)
+                    last_hat_y = hat_y
+                last_buttons = buttons
+
+            lt = pad.bLeftTrigger
+            if lt != last_lt:
+                process(_XInputEvent("ABS_Z", lt), now)
+                last_lt = lt
+            rt = pad.bRightTrigger
+            if rt != last_rt:
+                process(_XInputEvent("ABS_RZ", rt), now)
+                last_rt = rt
+
+    def _inputs_loop(self) -> None:
+        """Loop di lettura tramite la libreria inputs.
+
+        Legge direttamente dal gamepad rilevato: ogni read() restituisce
+        l'intero report del dispositivo (tutti gli eventi fino al SYN),
+        evitando la risoluzione di inputs.devices.gamepads ad ogni ciclo.
+        """
+        read = self._gamepad.read
+        process = self._process_event
+        poll_ring = self._poll_ring
+        ring_size = self.POLL_RING_SIZE
+
         while self._running:
             try:
-                events = inputs.get_gamepad()
-                now = time.time()
-                self._poll_timestamps.append(now)
+                events = read()
+                now = time.perf_counter_ns()
+                head = self._poll_head
+                poll_ring[head] = now
+                self._poll_head = (head + 1) % ring_size
+                if self._poll_count < ring_size:
+                    self._poll_count += 1
 
                 for event in events:
-                    self._process_event(event, now)
+                    process(event, now)
 
             except inputs.UnpluggedError:
                 logger.warning("Controller scollegato")
@@ -234,96 +574,78 @@ class ControllerMonitor:
                 logger.error("Errore lettura input: %s", e)
                 time.sleep(0.01)
 
-    def _process_event(self, event, timestamp: float) -> None:
+    def _process_event(self, event, timestamp: int) -> None:
         """Processa un singolo evento input, tracciando press e release.
 
         Args:
             event: evento dalla libreria inputs
-            timestamp: momento della ricezione
+            timestamp: momento della ricezione in ns (perf_counter_ns)
         """
-        code = event.code
-        state = event.state
+        entry = self._code_table.get(event.code)
+        if entry is None:
+            return
 
-        button_name = None
-        is_press = False
-        is_release = False
+        button_name, kind, threshold, mask, button_bit = entry
+        state = event.state
 
-        # Pulsanti digitali: state 1 = press, state 0 = release
-        if code in self.BUTTON_MAP:
-            button_name = self.BUTTON_MAP[code]
+        if kind == self._KIND_BUTTON:
+            # Pulsanti digitali: state 1 = press, state 0 = release
             if state == 1:
                 is_press = True
             elif state == 0:
-                is_release = True
-
-        # Trigger analogici
-        elif code in self.TRIGGER_MAP:
-            trigger_name = self.TRIGGER_MAP[code]
-            was_pressed = self._trigger_states.get(code, False)
-            is_pressed = state > self._trigger_threshold
-
-            if is_pressed and not was_pressed:
-                button_name = trigger_name
-                is_press = True
-            elif not is_pressed and was_pressed:
-                button_name = trigger_name
-                is_release = True
-
-            self._trigger_states[code] = is_pressed
-
-        # D-Pad
-        elif code in self.DPAD_MAP:
-            dpad_name = self.DPAD_MAP[code]
-            was_pressed = self._dpad_states.get(code, False)
-            is_pressed = state != 0
-
-            if is_pressed and not was_pressed:
-                button_name = dpad_name
-                is_press = True
-            elif not is_pressed and was_pressed:
-                button_name = dpad_name
-                is_release = True
-
-            self._dpad_states[code] = is_pressed
-
-        if button_name is None:
-            return
+                is_press = False
+            else:
+                return
+        else:
+            # Trigger analogici e D-Pad: conta solo il cambio di stato
+            is_pressed = abs(state) > threshold
+            was_pressed = (self._state_bits & mask) != 0
+            if is_pressed == was_pressed:
+                return
+            self._state_bits ^= mask
+            is_press = is_pressed
 
         # Filtro per pulsante monitorato
-        if self.monitored_button and button_name != self.monitored_button:
+        if not self._monitored_mask & button_bit:
             return
 
         if is_press:
             self._button_press_times[button_name] = timestamp
 
-        elif is_release:
+        else:
             press_time = self._button_press_times.pop(button_name, None)
             if press_time is not None:
-                duration_ms = (timestamp - press_time) * 1000.0
+                duration_ms = (timestamp - press_time) / 1_000_000
                 self._register_press(button_name, press_time, timestamp, duration_ms)
 
     def _register_press(
-        self, button: str, press_time: float,
-        release_time: float, duration_ms: float
+        self, button: str, press_time: int,
+        release_time: int, duration_ms: float
     ) -> None:
         """Registra una pressione completa e aggiorna le statistiche.
 
         Args:
             button: nome del pulsante
-            press_time: timestamp della pressione
-            release_time: timestamp del rilascio
+            press_time: timestamp della pressione in ns
+            release_time: timestamp del rilascio in ns
             duration_ms: durata in millisecondi
         """
         event = PressEvent(
             button=button,
             press_time=press_time,
             release_time=release_time,
-            duration_ms=round(duration_ms, 2),
+            duration_ms=duration_ms,
         )
 
-        with self._lock:
-            self._press_log.append(event)
-            self._update_stats(event)
+        idx = self._write_idx
+        # A buffer pieno lo slot contiene il piu' vecchio, che viene sovrascritto
+        self._press_ring[idx % self.PRESS_LOG_SIZE] = event
+        self._sum_duration_ms += event.duration_ms
+        # idx + 1 = pressioni registrate nella sessione
+        self.stats.avg_duration_ms = self._sum_duration_ms / (idx + 1)
+        self._update_stats(event)
+        # Pubblica la nuova pressione al consumer (store atomico sotto GIL)
+        self._write_idx = idx + 1
 
         if self._on_press_complete:
             try:
@@ -337,29 +659,28 @@ class ControllerMonitor:
         Args:
             event: evento pressione completata
         """
+        # Riferimenti locali: eseguito ad ogni pressione nel thread monitor
+        stats = self.stats
         d = event.duration_ms
-        self.stats.total_presses += 1
-        self.stats.last_duration_ms = d
-        self.stats.presses_per_button[event.button] = (
-            self.stats.presses_per_button.get(event.button, 0) + 1
-        )
+        button = event.button
+        stats.total_presses += 1
+        stats.last_duration_ms = d
+        per_button = stats.presses_per_button
+        per_button[button] = per_button.get(button, 0) + 1
 
-        if d < self.stats.min_duration_ms:
-            self.stats.min_duration_ms = d
-        if d > self.stats.max_duration_ms:
-            self.stats.max_duration_ms = d
+        if d < stats.min_duration_ms:
+            stats.min_duration_ms = d
+        if d > stats.max_duration_ms:
+            stats.max_duration_ms = d
 
         # Verifica soglia (successo = durata SOTTO la soglia)
-        was_below = self.stats.below_threshold
-        self.stats.below_threshold = d <= self.threshold_ms
-
-        if self.stats.below_threshold:
-            self.stats.threshold_successes += 1
+        below = d <= self.threshold_ms
+        stats.below_threshold = below
+        if below:
+            stats.threshold_successes += 1
 
         # Salva nello storico
-        self.stats.durations_history.append(
-            (event.release_time, d, event.button)
-        )
+        stats.append_history(event.release_time, d, self.BUTTON_IDS[button])
 
     def get_recent_presses(self, last_n: int = 50) -> list[PressEvent]:
         """Restituisce le ultime N pressioni.
@@ -367,76 +688,89 @@ class ControllerMonitor:
         Args:
             last_n: numero di pressioni da restituire
         """
-        with self._lock:
-            return list(self._press_log[-last_n:])
+        end = self._write_idx
+        size = self.PRESS_LOG_SIZE
+        start = max(0, end - min(last_n, size))
+        ring = self._press_ring
+        return [ring[i % size] for i in range(start, end)]
 
     def get_press_log(self) -> list[PressEvent]:
         """Restituisce il log completo delle pressioni."""
-        with self._lock:
-            return list(self._press_log)
+        return self.get_recent_presses(self.PRESS_LOG_SIZE)
 
     def get_avg_duration(self) -> float:
-        """Restituisce la durata media delle pressioni in ms."""
-        with self._lock:
-            if not self._press_log:
-                return 0.0
-            total = sum(p.duration_ms for p in self._press_log)
-            return round(total / len(self._press_log), 2)
+        """Restituisce la durata media delle pressioni in ms.
 
-    def get_polling_rate(self) -> float:
-        """Calcola il polling rate effettivo in Hz dal thread di input."""
-        if len(self._poll_timestamps) < 10:
-            return 0.0
+        Media su tutte le pressioni della sessione (non solo quelle nel log
+        in memoria), mantenuta dal thread monitor ad ogni pressione
+        (stats.avg_duration_ms): lettura O(1) e senza lock.
+        """
+        return round(self.stats.avg_duration_ms, 2)
 
-        timestamps = list(self._poll_timestamps)
-        # Usa solo gli ultimi 200 campioni per un valore stabile
-        recent = timestamps[-200:]
-        if len(recent) < 2:
-            return 0.0
+    def _recent_polls(self, last_n: int) -> np.ndarray:
+        """Restituisce gli ultimi N timestamp di poll in ordine cronologico.
+
+        Args:
+            last_n: numero massimo di campioni
+        """
+        head = self._poll_head
+        n = min(last_n, self._poll_count)
+        start = head - n
+        if start >= 0:
+            return self._poll_ring[start:head].copy()
+        # Il tratto richiesto scavalca la fine del ring: unisce le due parti
+        return np.concatenate((self._poll_ring[start:], self._poll_ring[:head]))
+
+    def _poll_snapshot(self) -> tuple[float, dict]:
+        """Polling rate e statistiche latenza dagli ultimi 200 poll.
+
+        Il calcolo si ripete solo se dall'ultima chiamata e' arrivato un
+        nuovo poll (chiave: timestamp piu' recente nel ring); senza input
+        si restituisce il risultato precedente, stesso dict compreso.
+        """
+        if self._poll_count < 10:
+            return 0.0, {"avg": 0.0, "min": 0.0, "max": 0.0, "jitter": 0.0}
+
+        # Lo slot prima di _poll_head e' gia' scritto quando head viene pubblicato
+        last_ns = int(self._poll_ring[self._poll_head - 1])
+        cached = self._poll_snapshot_cache
+        if cached is not None and cached[0] == last_ns:
+            return cached[1], cached[2]
+
+        recent = self._recent_polls(200)
+        total_time = int(recent[-1] - recent[0]) / 1e9
+        rate = (len(recent) - 1) / total_time if total_time > 0 else 0.0
+
+        intervals_ms = np.diff(recent) / 1e6
+        latency = {
+            "avg": round(float(intervals_ms.mean()), 2),
+            "min": round(float(intervals_ms.min()), 2),
+            "max": round(float(intervals_ms.max()), 2),
+            "jitter": round(float(intervals_ms.std()), 2),
+        }
+        self._poll_snapshot_cache = (last_ns, rate, latency)
+        return rate, latency
 
-        total_time = recent[-1] - recent[0]
-        if total_time > 0:
-            return (len(recent) - 1) / total_time
-        return 0.0
+    def get_polling_rate(self) -> float:
+        """Calcola il polling rate effettivo in Hz dal thread di input."""
+        return self._poll_snapshot()[0]
 
     def get_latency_stats(self) -> dict:
         """Calcola statistiche di latenza dagli intervalli tra poll.
 
+        Il dict restituito puo' essere condiviso tra chiamate: non modificarlo.
+
         Returns:
             dict con avg, min, max, jitter in ms
         """
-        if len(self._poll_timestamps) < 10:
-            return {"avg": 0.0, "min": 0.0, "max": 0.0, "jitter": 0.0}
-
-        timestamps = list(self._poll_timestamps)
-        recent = timestamps[-200:]
-        intervals_ms = [
-            (recent[i] - recent[i - 1]) * 1000
-            for i in range(1, len(recent))
-        ]
-
-        avg = sum(intervals_ms) / len(intervals_ms)
-        min_val = min(intervals_ms)
-        max_val = max(intervals_ms)
-        variance = sum((x - avg) ** 2 for x in intervals_ms) / len(intervals_ms)
-        jitter = variance ** 0.5
-
-        return {
-            "avg": round(avg, 2),
-            "min": round(min_val, 2),
-            "max": round(max_val, 2),
-            "jitter": round(jitter, 2),
-        }
+        return self._poll_snapshot()[1]
 
     def get_session_duration(self) -> float:
         """Restituisce la durata della sessione in secondi."""
         if self.stats.start_time == 0:
             return 0.0
-        return time.time() - self.stats.start_time
+        return (time.perf_counter_ns() - self._session_start_ns) / 1e9
 
     def get_available_buttons(self) -> list[str]:
         """Restituisce la lista di nomi pulsanti disponibili."""
-        all_buttons = list(self.BUTTON_MAP.values())
-        all_buttons.extend(self.TRIGGER_MAP.values())
-        all_buttons.extend(self.DPAD_MAP.values())
-        return all_buttons
+        return list(self.AVAILABLE_BUTTONS)
@@ -4,13 +4,21 @@ Salvataggio statistiche sessioni in CSV (con focus su durata pressioni),
 gestione profili multipli, export dati.
 """
 
+import atexit
 import csv
+import io
 import json
 import logging
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Intestazioni CSV per il file sessioni
@@ -30,6 +38,30 @@ CSV_HEADERS = [
     "threshold_successes",
 ]
 
+# Tipo di ogni colonna numerica del CSV sessioni (le altre restano str)
+CSV_CONVERTERS = {
+    "press_count": int,
+    "threshold_successes": int,
+    "session_duration_s": float,
+    "min_duration_ms": float,
+    "avg_duration_ms": float,
+    "max_duration_ms": float,
+    "latency_avg_ms": float,
+    "jitter_ms": float,
+    "threshold_ms": float,
+}
+
+
+def _json_loads(data: bytes):
+    """Decodifica JSON con orjson se disponibile, altrimenti con json.
+
+    orjson.JSONDecodeError deriva da json.JSONDecodeError, quindi i
+    chiamanti gestiscono gli errori allo stesso modo.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class DataManager:
     """Gestisce persistenza dati: profili utente e statistiche sessioni."""
@@ -46,8 +78,18 @@ class DataManager:
         self.profiles_file = self.data_dir / "profiles.json"
         self.current_profile: Optional[str] = None
 
+        # Handle CSV persistente del profilo attivo (aperto al primo salvataggio)
+        self._csv_fh = None
+        self._csv_writer = None
+        self._csv_profile: Optional[str] = None
+        # Profili modificati in memoria ma non ancora scritti su disco
+        self._profiles_dirty = False
+        # Sessioni gia' lette per file CSV: path -> (mtime_ns, size, sessioni)
+        self._sessions_cache: dict[Path, tuple[int, int, list[dict]]] = {}
+
         self._ensure_directories()
         self._load_profiles()
+        atexit.register(self._flush_profiles)
 
     def _ensure_directories(self) -> None:
         """Crea le directory necessarie se non esistono."""
@@ -56,13 +98,14 @@ class DataManager:
     def _load_profiles(self) -> None:
         """Carica i profili utente dal file JSON."""
         self._profiles: dict = {}
-        if self.profiles_file.exists():
-            try:
-                with open(self.profiles_file, "r", encoding="utf-8") as f:
-                    self._profiles = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error("Errore caricamento profili: %s", e)
-                self._profiles = {}
+        try:
+            with open(self.profiles_file, "rb") as f:
+                self._profiles = _json_loads(f.read())
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, IOError) as e:
+            logger.error("Errore caricamento profili: %s", e)
+            self._profiles = {}
 
         if "default" not in self._profiles:
             self.create_profile("default")
@@ -70,11 +113,20 @@ class DataManager:
     def _save_profiles(self) -> None:
         """Salva i profili su disco."""
         try:
-            with open(self.profiles_file, "w", encoding="utf-8") as f:
-                json.dump(self._profiles, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(self._profiles, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self._profiles, indent=2, ensure_ascii=False).encode("utf-8")
+            self.profiles_file.write_bytes(data)
+            self._profiles_dirty = False
         except IOError as e:
             logger.error("Errore salvataggio profili: %s", e)
 
+    def _flush_profiles(self) -> None:
+        """Scrive i profili su disco solo se ci sono modifiche pendenti."""
+        if self._profiles_dirty:
+            self._save_profiles()
+
     def get_profiles(self) -> list[str]:
         """Restituisce la lista dei nomi profilo disponibili."""
         return list(self._profiles.keys())
@@ -102,6 +154,8 @@ class DataManager:
             logger.warning("Profilo '%s' non trovato", name)
             return False
 
+        if name != self._csv_profile:
+            self._close_csv()
         self.current_profile = name
         return True
 
@@ -116,12 +170,15 @@ class DataManager:
         del self._profiles[name]
         self._save_profiles()
 
+        if self._csv_profile == name:
+            self._close_csv()
+
         csv_path = self._get_csv_path(name)
-        if csv_path.exists():
-            try:
-                csv_path.unlink()
-            except IOError as e:
-                logger.error("Errore eliminazione file dati: %s", e)
+        self._sessions_cache.pop(csv_path, None)
+        try:
+            csv_path.unlink(missing_ok=True)
+        except IOError as e:
+            logger.error("Errore eliminazione file dati: %s", e)
 
         if self.current_profile == name:
             self.current_profile = "default"
@@ -167,36 +224,35 @@ class DataManager:
             True se il salvataggio e' riuscito
         """
         profile = self.current_profile or "default"
-        csv_path = self._get_csv_path(profile)
-        file_exists = csv_path.exists()
 
         try:
-            with open(csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow(CSV_HEADERS)
-
-                writer.writerow([
-                    datetime.now().isoformat(),
-                    profile,
-                    button,
-                    press_count,
-                    round(session_duration, 1),
-                    round(min_duration_ms, 2),
-                    round(avg_duration_ms, 2),
-                    round(max_duration_ms, 2),
-                    connection_type,
-                    round(latency_avg, 2),
-                    round(jitter, 2),
-                    round(threshold_ms, 1),
-                    threshold_successes,
-                ])
+            writer = self._get_csv_writer(profile)
+            writer.writerow([
+                datetime.now().isoformat(),
+                profile,
+                button,
+                press_count,
+                round(session_duration, 1),
+                round(min_duration_ms, 2),
+                round(avg_duration_ms, 2),
+                round(max_duration_ms, 2),
+                connection_type,
+                round(latency_avg, 2),
+                round(jitter, 2),
+                round(threshold_ms, 1),
+                threshold_successes,
+            ])
+            # Un solo write per salvataggio, il file resta aperto
+            self._csv_fh.flush()
+            self._sessions_cache.pop(self._get_csv_path(profile), None)
 
             if profile in self._profiles:
                 self._profiles[profile]["sessions_count"] = (
                     self._profiles[profile].get("sessions_count", 0) + 1
                 )
-                self._save_profiles()
+                # Il contatore viene scritto alla chiusura o alla prossima
+                # modifica dei profili, non ad ogni sessione
+                self._profiles_dirty = True
 
             logger.info("Sessione salvata per profilo '%s'", profile)
             return True
@@ -205,78 +261,172 @@ class DataManager:
             logger.error("Errore salvataggio sessione: %s", e)
             return False
 
+    def _get_csv_writer(self, profile: str):
+        """Restituisce il writer CSV del profilo, aprendo il file se serve.
+
+        Il file resta aperto in append con buffer ampio fino al cambio
+        profilo o alla chiusura; l'header viene scritto se il file e' vuoto.
+        """
+        if self._csv_profile != profile or self._csv_fh is None:
+            self._close_csv()
+            self._csv_fh = open(
+                self._get_csv_path(profile), "a", newline="",
+                encoding="utf-8", buffering=1 << 16,
+            )
+            self._csv_writer = csv.writer(self._csv_fh)
+            self._csv_profile = profile
+            if self._csv_fh.tell() == 0:
+                self._csv_writer.writerow(CSV_HEADERS)
+        return self._csv_writer
+
+    def _close_csv(self) -> None:
+        """Chiude l'handle CSV persistente, se aperto."""
+        if self._csv_fh is None:
+            return
+        try:
+            self._csv_fh.close()
+        except IOError as e:
+            logger.error("Errore chiusura file sessioni: %s", e)
+        self._csv_fh = None
+        self._csv_writer = None
+        self._csv_profile = None
+
+    def close(self) -> None:
+        """Rilascia le risorse aperte (da chiamare alla chiusura dell'app)."""
+        self._close_csv()
+        self._flush_profiles()
+
     def load_sessions(self, profile_name: Optional[str] = None) -> list[dict]:
         """Carica tutte le sessioni di un profilo.
 
+        Il parsing viene memorizzato e riusato finche' il file non cambia
+        (mtime e dimensione): aperture ripetute dello storico non rileggono
+        il CSV.
+
         Returns:
-            lista di dict con i dati delle sessioni
+            lista di dict con i dati delle sessioni; la lista e' condivisa
+            con la cache e non va modificata
         """
         csv_path = self._get_csv_path(profile_name)
-        if not csv_path.exists():
+        try:
+            st = csv_path.stat()
+        except FileNotFoundError:
+            self._sessions_cache.pop(csv_path, None)
             return []
 
+        cached = self._sessions_cache.get(csv_path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+
         sessions = []
         try:
-            with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
+            with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return []
+                # Un convertitore per colonna, risolto una volta sola
+                converters = [CSV_CONVERTERS.get(key, str) for key in header]
                 for row in reader:
-                    for key in ["press_count", "threshold_successes"]:
-                        if key in row:
-                            row[key] = int(row[key])
-                    for key in ["session_duration_s", "min_duration_ms",
-                                "avg_duration_ms", "max_duration_ms",
-                                "latency_avg_ms", "jitter_ms", "threshold_ms"]:
-                        if key in row:
-                            row[key] = float(row[key])
-                    sessions.append(row)
+                    if not row:
+                        continue
+                    sessions.append({
+                        key: conv(value)
+                        for key, conv, value in zip(header, converters, row)
+                    })
+        except FileNotFoundError:
+            return []
         except (IOError, ValueError) as e:
             logger.error("Errore caricamento sessioni: %s", e)
+            return sessions
 
+        self._sessions_cache[csv_path] = (st.st_mtime_ns, st.st_size, sessions)
         return sessions
 
     def export_all_data(self, output_path: str) -> bool:
-        """Esporta tutti i dati di tutti i profili in un unico CSV."""
-        all_sessions = []
+        """Esporta tutti i dati di tutti i profili in un unico CSV.
+
+        I CSV dei profili hanno tutti lo stesso schema: vengono concatenati
+        byte per byte saltando l'header, senza parsing delle righe. Un file
+        con header diverso o senza newline finale (modificato a mano o
+        troncato) passa invece dal modulo csv, cosi' righe di file diversi
+        non si fondono e le colonne restano allineate per nome.
+        """
+        expected_header = ",".join(CSV_HEADERS).encode("utf-8")
+        # (percorso, copiabile byte per byte)
+        sources: list[tuple[Path, bool]] = []
         for profile_name in self._profiles:
-            sessions = self.load_sessions(profile_name)
-            all_sessions.extend(sessions)
+            csv_path = self._get_csv_path(profile_name)
+            try:
+                with open(csv_path, "rb") as src:
+                    header = src.readline()
+                    if not src.read(1):
+                        continue
+                    src.seek(-1, 2)
+                    raw_ok = (header.rstrip(b"\r\n") == expected_header
+                              and src.read(1) == b"\n")
+                sources.append((csv_path, raw_ok))
+            except FileNotFoundError:
+                continue
+            except IOError as e:
+                logger.error("Errore lettura sessioni '%s': %s", profile_name, e)
 
-        if not all_sessions:
+        if not sources:
             logger.warning("Nessun dato da esportare")
             return False
 
         try:
-            with open(output_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-                writer.writeheader()
-                writer.writerows(all_sessions)
-
-            logger.info("Dati esportati in '%s' (%d sessioni)",
-                        output_path, len(all_sessions))
+            with open(output_path, "wb") as dst:
+                dst.write(expected_header + b"\r\n")
+                for csv_path, raw_ok in sources:
+                    if raw_ok:
+                        with open(csv_path, "rb") as src:
+                            src.readline()
+                            shutil.copyfileobj(src, dst, length=1 << 20)
+                    else:
+                        logger.warning("CSV '%s' non standard: export riga per riga", csv_path)
+                        dst.write(self._rows_as_csv(csv_path).encode("utf-8"))
+
+            logger.info("Dati esportati in '%s' (%d profili)",
+                        output_path, len(sources))
             return True
 
-        except IOError as e:
+        except (IOError, csv.Error) as e:
             logger.error("Errore export dati: %s", e)
             return False
 
+    @staticmethod
+    def _rows_as_csv(csv_path: Path) -> str:
+        """Rilegge un CSV sessioni e ne restituisce le righe nello schema CSV_HEADERS.
+
+        Le colonne sono abbinate per nome: quelle mancanti restano vuote,
+        quelle in piu' vengono ignorate. Nessun header nel risultato.
+        """
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=CSV_HEADERS, restval="",
+                                extrasaction="ignore", lineterminator="\r\n")
+        with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+            writer.writerows(csv.DictReader(f))
+        return out.getvalue()
+
     def load_settings(self) -> dict:
         """Carica le impostazioni dal file di configurazione."""
         defaults = {
             "soglia_durata_ms_default": 50.0,
-            "intervallo_aggiornamento_ms": 50,
+            "intervallo_aggiornamento_ms": 500,
+            "grafico_refresh_ms": 16,
             "percorso_dati": "data",
             "profilo_default": "default",
         }
 
-        if not self.config_path.exists():
-            return defaults
-
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                settings = json.load(f)
+            with open(self.config_path, "rb") as f:
+                settings = _json_loads(f.read())
             for key, value in defaults.items():
                 settings.setdefault(key, value)
             return settings
+        except FileNotFoundError:
+            return defaults
         except (json.JSONDecodeError, IOError) as e:
             logger.error("Errore caricamento settings: %s", e)
             return defaults
@@ -6,11 +6,125 @@ anomalie del controller.
 """
 
 import logging
+import math
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _sum64(values: np.ndarray) -> float:
+    """Somma con accumulatore float64 (riduzione a coppie di NumPy).
+
+    Gli array di durate sono float32: np.sum accumulerebbe in float32,
+    perdendo cifre su sessioni lunghe. np.add.reduce con dtype float64
+    converte a blocchi, senza copiare l'intero array.
+    """
+    return float(np.add.reduce(values, dtype=np.float64))
+
+
+def _std_around(values: np.ndarray, mean: float) -> float:
+    """Deviazione standard (popolazione) dato il valore medio gia' calcolato.
+
+    Somma degli scarti al quadrato sui valori centrati, come arr.std(),
+    ma riusa la media invece di ricalcolarla: una passata in meno e
+    nessuna cancellazione numerica come con sum(x^2) - n*mean^2.
+    """
+    dev = values - mean
+    return np.sqrt(_sum64(dev * dev) / values.size)
+
+
+@lru_cache(maxsize=64)
+def _pctile_indices(n: int) -> tuple[int, int, int, int]:
+    """Indici nell'array ordinato per percentili e mediana.
+
+    Args:
+        n: numero di campioni (>= 1)
+
+    Returns:
+        (indice p10, indice p90, indice mediano basso, indice mediano alto);
+        per n dispari i due indici mediani coincidono
+    """
+    k10 = max(0, int(n * 0.1))
+    k90 = min(n - 1, int(n * 0.9))
+    mid = n // 2
+    mid_lo = mid - 1 if n % 2 == 0 else mid
+    return k10, k90, mid_lo, mid
+
+
+def _tap_stats(arr: np.ndarray, part: np.ndarray, mid_lo: int, median: float) -> tuple:
+    """Conteggi <= 50/100 ms e std dei tap rapidi con operazioni NumPy.
+
+    Dopo la partizione part[:mid_lo + 1] contiene solo valori <= mediana
+    e oltre ci sono al piu' valori uguali alla mediana: si riduce sulla
+    vista, senza copiare i tap rapidi in un nuovo array.
+
+    Returns:
+        (n <= 50, n <= 100, std tap rapidi)
+    """
+    under_50ms = np.count_nonzero(arr <= 50)
+    under_100ms = np.count_nonzero(arr <= 100)
+
+    head = part[:mid_lo + 1]
+    ties = np.count_nonzero(part[mid_lo + 1:] <= median)
+    fast_count = head.size + ties
+    fast_std = 0.0
+    if fast_count > 1:
+        fast_mean = (_sum64(head) + ties * median) / fast_count
+        dev = head - fast_mean
+        sq_sum = _sum64(dev * dev) + ties * (median - fast_mean) ** 2
+        fast_std = np.sqrt(sq_sum / fast_count)
+
+    return under_50ms, under_100ms, fast_std
+
+
+def _press_stats(arr: np.ndarray, k10: int, k90: int, mid_lo: int, mid: int) -> tuple:
+    """Statistiche delle durate su un array float32 non vuoto.
+
+    Gli indici arrivano da _pctile_indices().
+
+    Returns:
+        (media, min, max, std, mediana, p10, p90, n<=50, n<=100, std tap rapidi)
+    """
+    avg = _sum64(arr) / arr.size
+    min_val = arr.min()
+    max_val = arr.max()
+    std_dev = _std_around(arr, avg)
+
+    # Mediana e percentili con una sola selezione parziale (O(n)),
+    # senza ordinare tutto l'array
+    part = np.partition(arr, np.array([mid_lo, mid, k10, k90]))
+    median = (part[mid_lo] + part[mid]) / 2
+
+    p10 = part[k10]
+    p90 = part[k90]
+
+    # Clustering sotto 50/100 ms e consistenza dei tap rapidi (sotto mediana)
+    under_50ms, under_100ms, fast_std = _tap_stats(arr, part, mid_lo, median)
+
+    return (avg, min_val, max_val, std_dev, median, p10, p90,
+            under_50ms, under_100ms, fast_std)
+
+
+def _session_reduce(cols: np.ndarray) -> tuple:
+    """Minimo e media per colonna della matrice sessioni (n x 4)."""
+    return cols.min(axis=0), cols.mean(axis=0)
+
+
+def _ols_slope(values: np.ndarray, mean: float) -> float:
+    """Pendenza ai minimi quadrati di values su x = 0..n-1 (n >= 2).
+
+    Forma chiusa con x centrato: sum(x) = 0, quindi basta sum(x * v);
+    sum(x^2) vale n(n^2 - 1)/12.
+    """
+    n = values.size
+    x = np.arange(n) - (n - 1) / 2
+    return np.sum(x * (values - mean)) / (n * (n * n - 1) / 12)
+
+
+@dataclass(slots=True, frozen=True)
 class DiagnosticSnapshot:
     """Snapshot diagnostico in un dato istante."""
     polling_rate_hz: float
@@ -29,12 +143,13 @@ class ControllerDiagnostics:
     Analizza le durate delle pressioni per rilevare anomalie.
     """
 
-    # Soglie qualita connessione basate su polling rate reale
-    QUALITY_THRESHOLDS = {
-        "Ottima": {"polling_min": 200, "jitter_max": 2.0},
-        "Buona": {"polling_min": 100, "jitter_max": 5.0},
-        "Discreta": {"polling_min": 50, "jitter_max": 10.0},
-    }
+    # Soglie qualita connessione basate su polling rate reale,
+    # dalla migliore: (qualita, polling minimo Hz, jitter massimo ms)
+    QUALITY_THRESHOLDS = (
+        ("Ottima", 200.0, 2.0),
+        ("Buona", 100.0, 5.0),
+        ("Discreta", 50.0, 10.0),
+    )
 
     def evaluate_connection(self, polling_rate: float, latency_stats: dict) -> str:
         """Valuta la qualita della connessione.
@@ -46,14 +161,33 @@ class ControllerDiagnostics:
         Returns:
             stringa qualita: "Ottima", "Buona", "Discreta", "Scarsa" o "N/D"
         """
+        return self._evaluate_with_jitter(polling_rate, latency_stats.get("jitter", 0))
+
+    def _evaluate_with_jitter(self, polling_rate: float, jitter: float) -> str:
+        """Come evaluate_connection, con il jitter gia' estratto.
+
+        Args:
+            polling_rate: Hz dal ControllerMonitor
+            jitter: jitter in ms
+        """
         if polling_rate == 0:
             return "N/D"
 
-        jitter = latency_stats.get("jitter", 0)
+        # Soglie intere (Hz) e a passi di 0.1 ms: floor del polling e ceil
+        # del jitter in decimi danno lo stesso esito dei valori esatti
+        return self._evaluate_quantized(int(polling_rate), math.ceil(jitter * 10))
 
-        for quality, thresholds in self.QUALITY_THRESHOLDS.items():
-            if (polling_rate >= thresholds["polling_min"] and
-                    jitter <= thresholds["jitter_max"]):
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _evaluate_quantized(polling_hz: int, jitter_tenths: int) -> str:
+        """Qualita per polling (Hz interi) e jitter (decimi di ms), memoizzata.
+
+        Args:
+            polling_hz: polling rate troncato all'intero
+            jitter_tenths: jitter in decimi di ms, arrotondato per eccesso
+        """
+        for quality, polling_min, jitter_max in ControllerDiagnostics.QUALITY_THRESHOLDS:
+            if polling_hz >= polling_min and jitter_tenths <= jitter_max * 10:
                 return quality
 
         return "Scarsa"
@@ -65,13 +199,14 @@ class ControllerDiagnostics:
             polling_rate: Hz corrente
             latency_stats: statistiche latenza correnti
         """
+        jitter = latency_stats.get("jitter", 0)
         return DiagnosticSnapshot(
             polling_rate_hz=round(polling_rate, 1),
             latency_avg_ms=latency_stats.get("avg", 0),
             latency_min_ms=latency_stats.get("min", 0),
             latency_max_ms=latency_stats.get("max", 0),
-            jitter_ms=latency_stats.get("jitter", 0),
-            connection_quality=self.evaluate_connection(polling_rate, latency_stats),
+            jitter_ms=jitter,
+            connection_quality=self._evaluate_with_jitter(polling_rate, jitter),
         )
 
     def analyze_press_durations(self, durations_ms: list[float]) -> dict:
@@ -81,63 +216,43 @@ class ControllerDiagnostics:
         inconsistenze tra pressioni rapide.
 
         Args:
-            durations_ms: lista di durate in millisecondi
+            durations_ms: durate in millisecondi (lista o array NumPy)
 
         Returns:
-            dict con analisi dettagliata
+            dict con analisi dettagliata; le percentuali sono arrotondate
+            a un decimale, gli altri valori li formatta chi li visualizza
         """
-        if not durations_ms:
+        # float32 basta per durate in ms (0 - qualche migliaio) e dimezza
+        # la memoria letta da partizione e riduzioni
+        arr = np.asarray(durations_ms, dtype=np.float32)
+        n = arr.size
+        if n == 0:
             return {"error": "Nessun dato"}
-
-        n = len(durations_ms)
-        avg = sum(durations_ms) / n
-        min_val = min(durations_ms)
-        max_val = max(durations_ms)
-        variance = sum((x - avg) ** 2 for x in durations_ms) / n
-        std_dev = variance ** 0.5
-
-        # Mediana
-        sorted_d = sorted(durations_ms)
-        if n % 2 == 0:
-            median = (sorted_d[n // 2 - 1] + sorted_d[n // 2]) / 2
-        else:
-            median = sorted_d[n // 2]
-
-        # Percentili
-        p10 = sorted_d[max(0, int(n * 0.1))]
-        p90 = sorted_d[min(n - 1, int(n * 0.9))]
+        stats = _press_stats(arr, *_pctile_indices(n))
+        avg, min_val, max_val, std_dev, median, p10, p90 = map(float, stats[:7])
+        under_50ms = int(stats[7])
+        under_100ms = int(stats[8])
+        fast_std = float(stats[9])
 
         # Risoluzione minima del controller: la durata minima indica
         # il limite hardware/software di quanto breve puo' essere un input
         min_resolution = min_val
 
-        # Analisi clustering: quante pressioni sono sotto varie soglie
-        under_50ms = sum(1 for d in durations_ms if d <= 50)
-        under_100ms = sum(1 for d in durations_ms if d <= 100)
-
-        # Consistenza: quanto sono uniformi i tap rapidi (sotto mediana)
-        fast_presses = [d for d in durations_ms if d <= median]
-        fast_std = 0.0
-        if len(fast_presses) > 1:
-            fast_avg = sum(fast_presses) / len(fast_presses)
-            fast_var = sum((x - fast_avg) ** 2 for x in fast_presses) / len(fast_presses)
-            fast_std = fast_var ** 0.5
-
         return {
             "campioni": n,
-            "media_ms": round(avg, 2),
-            "mediana_ms": round(median, 2),
-            "min_ms": round(min_val, 2),
-            "max_ms": round(max_val, 2),
-            "std_dev_ms": round(std_dev, 2),
-            "percentile_10": round(p10, 2),
-            "percentile_90": round(p90, 2),
-            "risoluzione_minima_ms": round(min_resolution, 2),
+            "media_ms": avg,
+            "mediana_ms": median,
+            "min_ms": min_val,
+            "max_ms": max_val,
+            "std_dev_ms": std_dev,
+            "percentile_10": p10,
+            "percentile_90": p90,
+            "risoluzione_minima_ms": min_resolution,
             "sotto_50ms": under_50ms,
             "sotto_50ms_pct": round(under_50ms / n * 100, 1),
             "sotto_100ms": under_100ms,
             "sotto_100ms_pct": round(under_100ms / n * 100, 1),
-            "consistenza_tap_rapidi_std": round(fast_std, 2),
+            "consistenza_tap_rapidi_std": fast_std,
         }
 
     def compare_sessions(self, sessions: list[dict]) -> dict:
@@ -152,48 +267,59 @@ class ControllerDiagnostics:
         if not sessions:
             return {"error": "Nessuna sessione da confrontare"}
 
-        min_durations = [s.get("min_duration_ms", 0) for s in sessions]
-        avg_durations = [s.get("avg_duration_ms", 0) for s in sessions]
-        latencies = [s.get("latency_avg_ms", 0) for s in sessions]
-        jitters = [s.get("jitter_ms", 0) for s in sessions]
+        # Una sola passata sulle sessioni: colonne min, avg, latenza, jitter.
+        # np.fromiter consuma il generatore senza liste o tuple intermedie
+        keys = ("min_duration_ms", "avg_duration_ms", "latency_avg_ms", "jitter_ms")
+        n = len(sessions)
+        cols = np.fromiter(
+            (s.get(k, 0) for s in sessions for k in keys),
+            dtype=np.float64,
+            count=n * len(keys),
+        ).reshape(n, len(keys))
+        mins, means = _session_reduce(cols)
 
         return {
             "sessioni_totali": len(sessions),
             "durata_pressione": {
-                "best_min_ms": round(min(min_durations), 2) if min_durations else 0,
-                "media_avg_ms": round(sum(avg_durations) / len(avg_durations), 2) if avg_durations else 0,
-                "trend": self._calculate_trend(min_durations),
+                "best_min_ms": float(mins[0]),
+                "media_avg_ms": float(means[1]),
+                "trend": self._calculate_trend(cols[:, 0]),
             },
             "latenza": {
-                "media_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0,
-                "migliore_ms": round(min(latencies), 2) if latencies else 0,
+                "media_ms": float(means[2]),
+                "migliore_ms": float(mins[2]),
             },
             "jitter": {
-                "medio_ms": round(sum(jitters) / len(jitters), 2) if jitters else 0,
+                "medio_ms": float(means[3]),
             },
         }
 
     @staticmethod
-    def _calculate_trend(values: list[float]) -> str:
+    def _calculate_trend(values) -> str:
         """Calcola il trend di una serie (per durate: piu' basso = migliore).
 
         Args:
-            values: serie di valori temporali
+            values: serie di valori temporali (lista o array NumPy)
 
         Returns:
             "miglioramento", "peggioramento" o "stabile"
         """
-        if len(values) < 3:
+        # Nessuna copia se arriva gia' una colonna float64 (compare_sessions)
+        values = np.asarray(values, dtype=np.float64)
+        n = values.size
+        if n < 3:
             return "dati insufficienti"
 
-        mid = len(values) // 2
-        first_half = sum(values[:mid]) / mid
-        second_half = sum(values[mid:]) / (len(values) - mid)
-
-        if first_half == 0:
+        mean = float(values.mean())
+        if mean == 0:
             return "stabile"
 
-        diff_pct = ((second_half - first_half) / first_half * 100)
+        # Pendenza ai minimi quadrati: usa tutti i punti invece del solo
+        # confronto tra meta'
+        slope = float(_ols_slope(values, mean))
+
+        # Variazione stimata lungo tutta la serie, in % della media
+        diff_pct = slope * n / mean * 100
 
         # Per le durate: diminuire e' migliorare
         if diff_pct < -5:
@@ -208,16 +334,28 @@ class ControllerDiagnostics:
         Args:
             sessions: lista di dict con dati sessione
         """
+        # Una sola passata: [sessioni, somma latenze, miglior durata minima]
+        acc = {
+            "USB": [0, 0.0, float("inf")],
+            "Bluetooth": [0, 0.0, float("inf")],
+        }
+        for s in sessions:
+            a = acc.get(s.get("connection_type"))
+            if a is None:
+                continue
+            a[0] += 1
+            a[1] += s.get("latency_avg_ms", 0)
+            min_dur = s.get("min_duration_ms", 0)
+            if min_dur < a[2]:
+                a[2] = min_dur
+
         result = {}
-        for label in ["USB", "Bluetooth"]:
-            group = [s for s in sessions if s.get("connection_type") == label]
-            if group:
-                latencies = [s.get("latency_avg_ms", 0) for s in group]
-                min_durs = [s.get("min_duration_ms", 0) for s in group]
+        for label, (count, latency_sum, best_min) in acc.items():
+            if count:
                 result[label] = {
-                    "sessioni": len(group),
-                    "latenza_media_ms": round(sum(latencies) / len(latencies), 2),
-                    "best_min_press_ms": round(min(min_durs), 2) if min_durs else 0,
+                    "sessioni": count,
+                    "latenza_media_ms": latency_sum / count,
+                    "best_min_press_ms": best_min,
                 }
             else:
                 result[label] = {"sessioni": 0, "latenza_media_ms": 0, "best_min_press_ms": 0}
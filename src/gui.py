@@ -6,23 +6,88 @@ log ultime pressioni.
 """
 
 import logging
+import queue
+import threading
 import tkinter as tk
+from collections import deque
+from itertools import groupby
 from tkinter import ttk, messagebox, filedialog
 from typing import Optional
 
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
 from .controller_monitor import ControllerMonitor, PressEvent
 from .data_manager import DataManager
 from .diagnostics import ControllerDiagnostics
 from .visualizer import RealtimeChart, HistoryVisualizer
-from .translations import get_text, get_flag_emoji, get_next_language
+from .translations import TRANSLATIONS, get_text, get_flag_emoji, get_next_language
 
 logger = logging.getLogger(__name__)
 
+# Font condivisi tra stili e widget (tuple costanti, costruite una volta)
+_FONT_UI = ("Segoe UI", 10)
+_FONT_UI_BOLD = ("Segoe UI", 10, "bold")
+_FONT_UI_LINK = ("Segoe UI", 10, "underline")
+_FONT_STATUS = ("Segoe UI", 9)
+_FONT_STATS = ("Segoe UI", 12)
+_FONT_HEADER = ("Segoe UI", 14, "bold")
+_FONT_BIG = ("Segoe UI", 28, "bold")
+
+# Sentinella di SessionStats.min_duration_ms prima della prima pressione
+_INF = float("inf")
+
+# Testo della voce "tutti i pulsanti" in ogni lingua ("All", "Tutti", ...)
+_ALL_BUTTON_ALIASES: frozenset[str] = frozenset(
+    texts["all_buttons"] for texts in TRANSLATIONS.values()
+)
+
 
 class App:
     """Finestra principale dell'applicazione."""
 
     WINDOW_MIN_SIZE = (960, 750)
+    # Pressioni in attesa del prossimo tick UI; oltre, si scartano le piu' vecchie
+    # (le statistiche restano comunque complete nel monitor)
+    PENDING_PRESSES_MAX = 1024
+    LOG_MAX_LINES = 100
+    # Indicizzati con (durata <= soglia): False -> sopra soglia, True -> sotto
+    DURATION_STYLES = ("Red.TLabel", "Green.TLabel")
+    LOG_TAGS = ("bad", "good")
+    # Isteresi delle label diagnostica: il valore mostrato cambia solo se
+    # quello nuovo se ne discosta almeno di tanto (Hz per polling, ms per gli altri)
+    POLLING_BAND_HZ = 10.0
+    LATENCY_BAND_MS = 0.1
+    # Righe del report storico: (chiave testo, sezione dati, campo, default, formato).
+    # Sezione None = titolo senza valore; riga None = riga vuota
+    REPORT_LINES = (
+        None,
+        ("report_press_duration", None, None, None, None),
+        ("report_best_min", "dur", "best_min_ms", 0, ".2f"),
+        ("report_avg_sessions", "dur", "media_avg_ms", 0, ".2f"),
+        ("report_trend", "dur", "trend", "-", ""),
+        None,
+        ("report_statistical", None, None, None, None),
+        ("report_median", "press", "mediana_ms", 0, ".2f"),
+        ("report_percentile_10", "press", "percentile_10", 0, ".2f"),
+        ("report_percentile_90", "press", "percentile_90", 0, ".2f"),
+        ("report_std_dev", "press", "std_dev_ms", 0, ".2f"),
+        None,
+        ("report_latency", None, None, None, None),
+        ("report_avg", "lat", "media_ms", 0, ".2f"),
+        ("report_best", "lat", "migliore_ms", 0, ".2f"),
+        None,
+        ("report_jitter", None, None, None, None),
+        ("report_avg_jitter", "jit", "medio_ms", 0, ".2f"),
+        None,
+        ("report_connection", None, None, None, None),
+    )
+    # Righe per ciascun tipo di connessione: (chiave testo, campo, formato)
+    REPORT_CONN_LINES = (
+        ("report_conn_sessions", "sessioni", ""),
+        ("report_conn_latency", "latenza_media_ms", ".2f"),
+        ("report_conn_best", "best_min_press_ms", ".2f"),
+    )
 
     def __init__(self):
         """Inizializza l'applicazione e tutti i componenti."""
@@ -36,22 +101,57 @@ class App:
 
         # Lingua (carica da settings)
         self._current_lang = self.settings.get("lingua", "en")
+        # Testi senza parametri gia' risolti nella lingua corrente
+        self._t_cache: dict[str, str] = {}
         self.root.title(self._t("window_title"))
 
         self.monitor = ControllerMonitor(
             threshold_ms=self.settings.get("soglia_durata_ms_default", 50.0)
         )
         self.diagnostics = ControllerDiagnostics()
+        # Valori letti ad ogni tick/pressione, aggiornati solo quando cambiano
+        self._update_interval_ms = int(self.settings.get("intervallo_aggiornamento_ms", 500))
+        # Ritmo di svuotamento della coda pressioni, lo stesso dei ridisegni del grafico
+        self._refresh_ms = int(self.settings.get("grafico_refresh_ms", 16))
+        self._threshold_ms = self.monitor.threshold_ms
+        # Valori delle combobox: si riassegnano (conversione in lista Tcl) solo se cambiano
+        self._button_names = tuple(self.monitor.get_available_buttons())
+        self._profiles_cache: tuple[str, ...] = ()
         self.history_viz = HistoryVisualizer(
             colors=self.settings.get("colori", {})
         )
 
         # Stato
         self._update_job: Optional[str] = None
+        self._press_job: Optional[str] = None
         self._session_active = False
-        # Coda thread-safe per pressioni dal thread monitor
-        self._pending_presses: list[PressEvent] = []
-        self._pending_lock = __import__("threading").Lock()
+        # Coda per pressioni dal thread monitor: append/popleft di deque
+        # sono atomici, nessun lock tra thread monitor e tick UI
+        self._pending_presses: deque[PressEvent] = deque(maxlen=self.PENDING_PRESSES_MAX)
+        # Finestra principale mappata (non iconificata): da nascosta niente ridisegni
+        self._root_visible = True
+        # Ultimo testo impostato per variabile (per nome Tcl), per evitare set() ridondanti
+        self._last_label_text: dict[str, str] = {}
+        # Secondo di sessione mostrato nel timer (-1 = nessuno)
+        self._last_session_second = -1
+        # Ultimo valore mostrato per le label con isteresi (vedi _set_banded)
+        self._last_label_value: dict[str, float] = {}
+        # Righe nel log pressioni, contate in Python senza interrogare Tk
+        self._log_line_count = 0
+        # Ultimi valori statistici scritti nelle label (vedi _update_presses)
+        self._last_stats_snapshot: tuple = ()
+        # Ultime stats latenza mostrate (vedi _refresh_diagnostics)
+        self._last_latency_stats: Optional[dict] = None
+        # Stile corrente della durata grande ("Green."/"Red.TLabel")
+        self._duration_style = "Big.TLabel"
+        # Analisi storico dell'ultima lista sessioni (vedi _history_analysis)
+        self._history_cache: Optional[tuple] = None
+        # Figure dello storico gia' costruite: (sessioni, soglia, [(tab, figura)])
+        self._history_figures: Optional[tuple] = None
+        # Finestra storico che sta mostrando le figure in cache
+        self._history_figures_window: Optional[tk.Toplevel] = None
+        # Dialog nuovo profilo, creato alla prima apertura e poi riusato
+        self._new_profile_dialog: Optional[tuple] = None
 
         # Colori dal settings
         self._colors = self.settings.get("colori", {
@@ -63,6 +163,36 @@ class App:
             "grafico_soglia": "#e67e22",
         })
 
+        # Label dei valori, create in _build_ui: dichiarate qui tutte insieme
+        self._lbl_duration: Optional[ttk.Label] = None
+        self._lbl_total: Optional[ttk.Label] = None
+        self._lbl_min: Optional[ttk.Label] = None
+        self._lbl_avg: Optional[ttk.Label] = None
+        self._lbl_max: Optional[ttk.Label] = None
+        self._lbl_successes: Optional[ttk.Label] = None
+        self._lbl_session_time: Optional[ttk.Label] = None
+        self._lbl_controller: Optional[ttk.Label] = None
+        self._lbl_connection: Optional[ttk.Label] = None
+        self._lbl_polling: Optional[ttk.Label] = None
+        self._lbl_latency: Optional[ttk.Label] = None
+        self._lbl_jitter: Optional[ttk.Label] = None
+        self._lbl_quality: Optional[ttk.Label] = None
+        # Testi aggiornati a runtime: le label li leggono via textvariable,
+        # var.set() evita il parsing delle opzioni di config(text=...)
+        self._var_duration = tk.StringVar(self.root, value="- -")
+        self._var_total = tk.StringVar(self.root, value="0")
+        self._var_min = tk.StringVar(self.root, value="- -")
+        self._var_avg = tk.StringVar(self.root, value="- -")
+        self._var_max = tk.StringVar(self.root, value="- -")
+        self._var_successes = tk.StringVar(self.root, value="0 / 0")
+        self._var_session_time = tk.StringVar(self.root, value="00:00")
+        self._var_controller = tk.StringVar(self.root, value=self._t("no_controller"))
+        self._var_connection = tk.StringVar(self.root, value="-")
+        self._var_polling = tk.StringVar(self.root, value="- Hz")
+        self._var_latency = tk.StringVar(self.root, value="- ms")
+        self._var_jitter = tk.StringVar(self.root, value="- ms")
+        self._var_quality = tk.StringVar(self.root, value="-")
+
         self._setup_style()
         self._build_ui()
 
@@ -85,27 +215,26 @@ class App:
 
         self.root.configure(bg=bg)
         style.configure("TFrame", background=bg)
-        style.configure("TLabel", background=bg, foreground=fg, font=("Segoe UI", 10))
-        style.configure("TButton", font=("Segoe UI", 10))
-        style.configure("Header.TLabel", font=("Segoe UI", 14, "bold"),
-                        background=bg, foreground=fg)
-        style.configure("Big.TLabel", font=("Segoe UI", 28, "bold"),
-                        background=bg, foreground=fg)
-        style.configure("Stats.TLabel", font=("Segoe UI", 12),
-                        background=bg, foreground=fg)
-        style.configure("Status.TLabel", font=("Segoe UI", 9),
-                        background=bg, foreground="#95a5a6")
-        style.configure("Green.TLabel", foreground=self._colors["sopra_soglia"],
-                        background=bg, font=("Segoe UI", 28, "bold"))
-        style.configure("Red.TLabel", foreground=self._colors["sotto_soglia"],
-                        background=bg, font=("Segoe UI", 28, "bold"))
-        style.configure("SmallGreen.TLabel", foreground=self._colors["sopra_soglia"],
-                        background=bg, font=("Segoe UI", 10))
-        style.configure("SmallRed.TLabel", foreground=self._colors["sotto_soglia"],
-                        background=bg, font=("Segoe UI", 10))
+        style.configure("TButton", font=_FONT_UI)
         style.configure("TLabelframe", background=bg, foreground=fg)
-        style.configure("TLabelframe.Label", background=bg, foreground=fg,
-                        font=("Segoe UI", 10, "bold"))
+
+        # Stili label su sfondo del tema: (nome, font, colore testo)
+        above = self._colors["sopra_soglia"]
+        below = self._colors["sotto_soglia"]
+        label_styles = (
+            ("TLabel", _FONT_UI, fg),
+            ("Header.TLabel", _FONT_HEADER, fg),
+            ("Big.TLabel", _FONT_BIG, fg),
+            ("Stats.TLabel", _FONT_STATS, fg),
+            ("Status.TLabel", _FONT_STATUS, "#95a5a6"),
+            ("Green.TLabel", _FONT_BIG, above),
+            ("Red.TLabel", _FONT_BIG, below),
+            ("SmallGreen.TLabel", _FONT_UI, above),
+            ("SmallRed.TLabel", _FONT_UI, below),
+            ("TLabelframe.Label", _FONT_UI_BOLD, fg),
+        )
+        for name, font, foreground in label_styles:
+            style.configure(name, background=bg, foreground=foreground, font=font)
 
     def _t(self, key: str, **kwargs) -> str:
         """Helper per ottenere testi tradotti.
@@ -117,7 +246,14 @@ class App:
         Returns:
             Testo tradotto nella lingua corrente
         """
-        return get_text(key, self._current_lang, **kwargs)
+        if kwargs:
+            # Testi formattati (conteggi, valori report, percorsi): non
+            # ripetibili, metterli in cache la farebbe solo crescere
+            return get_text(key, self._current_lang, **kwargs)
+        text = self._t_cache.get(key)
+        if text is None:
+            text = self._t_cache[key] = get_text(key, self._current_lang)
+        return text
 
     def _save_language(self) -> None:
         """Salva la lingua corrente nei settings."""
@@ -128,6 +264,9 @@ class App:
         """Cambia la lingua dell'interfaccia."""
         # Alterna lingua
         self._current_lang = get_next_language(self._current_lang)
+        # Testi della lingua precedente, per saltare i config() con testo identico
+        previous = self._t_cache
+        self._t_cache = {}
 
         # Aggiorna titolo finestra
         self.root.title(self._t("window_title"))
@@ -135,43 +274,19 @@ class App:
         # Aggiorna bandiera
         self._btn_flag.config(text=get_flag_emoji(self._current_lang))
 
-        # Aggiorna frames
-        self._stats_frame.config(text=self._t("stats_frame"))
-        self._config_frame.config(text=self._t("config_frame"))
-        self._chart_frame.config(text=self._t("chart_frame"))
-        self._diag_frame.config(text=self._t("diagnostics_frame"))
-        self._log_frame.config(text=self._t("log_frame"))
-
-        # Aggiorna label stats panel
-        self._lbl_last_label.config(text=self._t("last"))
-        self._lbl_ms.config(text=self._t("ms"))
-        for lbl, key in self._stats_labels_text:
-            lbl.config(text=self._t(key))
-
-        # Aggiorna label config panel
-        self._lbl_profile.config(text=self._t("profile"))
-        self._lbl_threshold.config(text=self._t("threshold_duration"))
-        self._lbl_button.config(text=self._t("button"))
-        self._btn_apply.config(text=self._t("apply"))
-
-        # Aggiorna pulsanti azione
-        self._btn_start.config(text=self._t("start"))
-        self._btn_stop.config(text=self._t("stop"))
-        self._btn_save.config(text=self._t("save_session"))
-        self._btn_history.config(text=self._t("history_charts"))
-        self._btn_export.config(text=self._t("export_data"))
+        # Aggiorna frame, label e pulsanti con testo fisso
+        for widget, key in self._translatable:
+            text = self._t(key)
+            if previous.get(key) != text:
+                widget.config(text=text)
 
         # Aggiorna combo button
         current_button = self._combo_button.get()
         # Mappa "Tutti" <-> "All"
-        if current_button in ["Tutti", "All"]:
+        if current_button in _ALL_BUTTON_ALIASES:
             self._combo_button.set(self._t("all_buttons"))
             current_button = None
-        self._combo_button["values"] = [self._t("all_buttons")] + self.monitor.get_available_buttons()
-
-        # Aggiorna label diagnostica
-        for lbl, key in self._diag_labels_text:
-            lbl.config(text=self._t(key))
+        self._combo_button["values"] = (self._t("all_buttons"), *self._button_names)
 
         # Aggiorna label soglia e assi nel grafico
         self._chart.set_threshold_label(self._t("threshold_label"))
@@ -196,11 +311,38 @@ class App:
         bottom_frame = ttk.Frame(main_frame)
         bottom_frame.pack(fill="x", pady=(5, 0))
 
+        # Widget con testo tradotto fisso: (widget, chiave), riempito dai
+        # pannelli e riusato da _switch_language
+        self._translatable: list[tuple[tk.Widget, str]] = []
+
         self._build_stats_panel(top_frame)
         self._build_config_panel(top_frame)
         self._build_chart_panel(mid_frame)
         self._build_bottom_panel(bottom_frame)
 
+        self._translatable.extend([
+            (self._stats_frame, "stats_frame"),
+            (self._config_frame, "config_frame"),
+            (self._chart_frame, "chart_frame"),
+            (self._diag_frame, "diagnostics_frame"),
+            (self._log_frame, "log_frame"),
+            (self._lbl_last_label, "last"),
+            (self._lbl_ms, "ms"),
+            (self._lbl_profile, "profile"),
+            (self._lbl_threshold, "threshold_duration"),
+            (self._lbl_button, "button"),
+            (self._btn_apply, "apply"),
+            (self._btn_start, "start"),
+            (self._btn_stop, "stop"),
+            (self._btn_save, "save_session"),
+            (self._btn_history, "history_charts"),
+            (self._btn_export, "export_data"),
+        ])
+
+        # Visibilita' della finestra: i figli ereditano il binding, si filtra su root
+        self.root.bind("<Map>", self._on_root_map)
+        self.root.bind("<Unmap>", self._on_root_unmap)
+
     def _build_stats_panel(self, parent: ttk.Frame) -> None:
         """Pannello statistiche: durata ultima pressione e statistiche sessione."""
         self._stats_frame = ttk.LabelFrame(parent, text=self._t("stats_frame"), padding=10)
@@ -212,7 +354,7 @@ class App:
 
         self._lbl_last_label = ttk.Label(dur_frame, text=self._t("last"), style="Stats.TLabel")
         self._lbl_last_label.pack(side="left")
-        self._lbl_duration = ttk.Label(dur_frame, text="- -", style="Big.TLabel")
+        self._lbl_duration = ttk.Label(dur_frame, textvariable=self._var_duration, style="Big.TLabel")
         self._lbl_duration.pack(side="left", padx=(10, 0))
         self._lbl_ms = ttk.Label(dur_frame, text=self._t("ms"), style="Stats.TLabel")
         self._lbl_ms.pack(side="left", padx=(5, 0))
@@ -221,24 +363,26 @@ class App:
         grid_frame = ttk.Frame(self._stats_frame)
         grid_frame.pack(fill="x")
 
-        # Salvo le label per poterle aggiornare quando cambia la lingua
-        self._stats_labels_text = []
         labels = [
-            ("total_presses", "_lbl_total", "0"),
-            ("min_duration", "_lbl_min", "- -"),
-            ("avg_duration", "_lbl_avg", "- -"),
-            ("max_duration", "_lbl_max", "- -"),
-            ("below_threshold", "_lbl_successes", "0 / 0"),
-            ("session_time", "_lbl_session_time", "00:00"),
+            ("total_presses", self._var_total),
+            ("min_duration", self._var_min),
+            ("avg_duration", self._var_avg),
+            ("max_duration", self._var_max),
+            ("below_threshold", self._var_successes),
+            ("session_time", self._var_session_time),
         ]
-        for i, (key, attr, default) in enumerate(labels):
+        values = []
+        for i, (key, var) in enumerate(labels):
             lbl_text = ttk.Label(grid_frame, text=self._t(key), style="Stats.TLabel")
             lbl_text.grid(row=i, column=0, sticky="w", pady=2)
-            self._stats_labels_text.append((lbl_text, key))
+            self._translatable.append((lbl_text, key))
 
-            lbl = ttk.Label(grid_frame, text=default, style="Stats.TLabel")
+            lbl = ttk.Label(grid_frame, textvariable=var, style="Stats.TLabel")
             lbl.grid(row=i, column=1, sticky="w", padx=(10, 0), pady=2)
-            setattr(self, attr, lbl)
+            values.append(lbl)
+
+        (self._lbl_total, self._lbl_min, self._lbl_avg, self._lbl_max,
+         self._lbl_successes, self._lbl_session_time) = values
 
     def _build_config_panel(self, parent: ttk.Frame) -> None:
         """Pannello configurazione: profilo, soglia, pulsante, azioni."""
@@ -273,7 +417,7 @@ class App:
         self._btn_flag = ttk.Label(
             flag_container,
             text=get_flag_emoji(self._current_lang),
-            font=("Segoe UI", 10, "underline"),
+            font=_FONT_UI_LINK,
             cursor="hand2",
             foreground=self._colors["testo"]
         )
@@ -302,7 +446,7 @@ class App:
         self._lbl_button = ttk.Label(self._config_frame, text=self._t("button"))
         self._lbl_button.pack(anchor="w")
         self._combo_button = ttk.Combobox(self._config_frame, state="readonly", width=15)
-        self._combo_button["values"] = [self._t("all_buttons")] + self.monitor.get_available_buttons()
+        self._combo_button["values"] = (self._t("all_buttons"), *self._button_names)
         self._combo_button.set(self._t("all_buttons"))
         self._combo_button.pack(fill="x", pady=(2, 8))
         self._combo_button.bind("<<ComboboxSelected>>", self._on_button_change)
@@ -346,6 +490,7 @@ class App:
             threshold_label=self._t("threshold_label"),
             x_axis_label=self._t("chart_x_axis"),
             y_axis_label=self._t("chart_y_axis"),
+            refresh_ms=self._refresh_ms,
         )
 
     def _build_bottom_panel(self, parent: ttk.Frame) -> None:
@@ -360,27 +505,29 @@ class App:
         grid = ttk.Frame(self._diag_frame)
         grid.pack(fill="x")
 
-        # Salvo le label per poterle aggiornare quando cambia la lingua
-        self._diag_labels_text = []
         diag_labels = [
-            ("controller", "_lbl_controller", self._t("no_controller")),
-            ("connection", "_lbl_connection", "-"),
-            ("polling_rate", "_lbl_polling", "- Hz"),
-            ("latency", "_lbl_latency", "- ms"),
-            ("jitter", "_lbl_jitter", "- ms"),
-            ("quality", "_lbl_quality", "-"),
+            ("controller", self._var_controller),
+            ("connection", self._var_connection),
+            ("polling_rate", self._var_polling),
+            ("latency", self._var_latency),
+            ("jitter", self._var_jitter),
+            ("quality", self._var_quality),
         ]
 
-        for i, (key, attr, default) in enumerate(diag_labels):
+        values = []
+        for i, (key, var) in enumerate(diag_labels):
             col = (i % 3) * 2
             row = i // 3
             lbl_text = ttk.Label(grid, text=self._t(key), style="Status.TLabel")
             lbl_text.grid(row=row, column=col, sticky="w", padx=(0, 5), pady=2)
-            self._diag_labels_text.append((lbl_text, key))
+            self._translatable.append((lbl_text, key))
 
-            lbl = ttk.Label(grid, text=default, style="Status.TLabel")
+            lbl = ttk.Label(grid, textvariable=var, style="Status.TLabel")
             lbl.grid(row=row, column=col + 1, sticky="w", padx=(0, 20), pady=2)
-            setattr(self, attr, lbl)
+            values.append(lbl)
+
+        (self._lbl_controller, self._lbl_connection, self._lbl_polling,
+         self._lbl_latency, self._lbl_jitter, self._lbl_quality) = values
 
         # Log ultime pressioni
         self._log_frame = ttk.LabelFrame(bottom_container, text=self._t("log_frame"), padding=8)
@@ -400,19 +547,24 @@ class App:
     # --- Callback dal thread monitor ---
 
     def _on_press_from_thread(self, event: PressEvent) -> None:
-        """Riceve pressione dal thread monitor. Accoda per elaborazione nel main thread."""
-        with self._pending_lock:
-            self._pending_presses.append(event)
+        """Riceve pressione dal thread monitor. Accoda soltanto.
+
+        Nessuna chiamata Tk da qui: con Tcl a thread event_generate resta
+        in attesa del mainloop e fermerebbe la misura delle pressioni.
+        La coda la svuota il main thread con _drain_presses.
+        """
+        self._pending_presses.append(event)
 
     # --- Callback azioni utente ---
 
     def _on_start(self) -> None:
         """Avvia il monitoraggio."""
         self.monitor.set_threshold(self._var_threshold.get())
+        self._threshold_ms = self.monitor.threshold_ms
 
         selected = self._combo_button.get()
         # Gestisce sia "Tutti" che "All" (traduzione)
-        if selected in ["Tutti", "All"]:
+        if selected in _ALL_BUTTON_ALIASES:
             self.monitor.set_monitored_button(None)
         else:
             self.monitor.set_monitored_button(selected)
@@ -426,27 +578,61 @@ class App:
 
         self._session_active = True
         self._chart.reset()
+        self._reset_session_labels()
 
         # Reset log
         self._log_text.config(state="normal")
         self._log_text.delete("1.0", "end")
         self._log_text.config(state="disabled")
+        self._log_line_count = 0
 
         # UI
         self._btn_start.config(state="disabled")
         self._btn_stop.config(state="normal")
         self._btn_save.config(state="disabled")
-        self._lbl_controller.config(text=self.monitor.controller_name)
-        self._lbl_connection.config(text=self.monitor.connection_type)
+        self._var_controller.set(self.monitor.controller_name)
+        self._var_connection.set(self.monitor.connection_type)
 
         self._schedule_update()
+        self._schedule_press_drain()
         logger.info("Monitoraggio avviato dall'interfaccia")
 
+    def _reset_session_labels(self) -> None:
+        """Riporta le label statistiche ai testi iniziali per una nuova sessione.
+
+        Azzera anche le cache che altrimenti salterebbero la riscrittura
+        (snapshot statistiche, ultimi testi/valori, secondo del timer).
+        """
+        # Pressioni rimaste dalla sessione precedente (es. finestra nascosta)
+        self._pending_presses.clear()
+        # Statistiche uguali a quelle della sessione precedente non vanno saltate
+        self._last_stats_snapshot = ()
+        self._last_label_text.clear()
+        self._last_label_value.clear()
+        self._last_session_second = -1
+        self._last_latency_stats = None
+
+        for var, text in (
+            (self._var_duration, "- -"),
+            (self._var_total, "0"),
+            (self._var_min, "- -"),
+            (self._var_avg, "- -"),
+            (self._var_max, "- -"),
+            (self._var_successes, "0 / 0"),
+        ):
+            var.set(text)
+
+        self._lbl_duration.config(style="Big.TLabel")
+        self._duration_style = "Big.TLabel"
+
     def _on_stop(self) -> None:
         """Ferma il monitoraggio."""
         if self._update_job:
             self.root.after_cancel(self._update_job)
             self._update_job = None
+        if self._press_job:
+            self.root.after_cancel(self._press_job)
+            self._press_job = None
 
         self.monitor.stop()
         self._session_active = False
@@ -468,7 +654,7 @@ class App:
             return
 
         avg_duration = self.monitor.get_avg_duration()
-        min_dur = stats.min_duration_ms if stats.min_duration_ms != float("inf") else 0
+        min_dur = stats.min_duration_ms if stats.min_duration_ms != _INF else 0
 
         button_name = self._combo_button.get()
 
@@ -487,6 +673,8 @@ class App:
         )
 
         if success:
+            self._history_cache = None
+            self._history_figures = None
             messagebox.showinfo(self._t("saved"), self._t("session_saved"))
             self._btn_save.config(state="disabled")
         else:
@@ -509,102 +697,190 @@ class App:
 
         notebook = ttk.Notebook(hist_window)
         notebook.pack(fill="both", expand=True, padx=5, pady=5)
+        loading = ttk.Label(hist_window, text=self._t("history_loading"), style="Stats.TLabel")
+        loading.place(relx=0.5, rely=0.5, anchor="center")
+
+        analysis = self._history_analysis(sessions)
+        threshold = self._threshold_ms
+        results: queue.Queue = queue.Queue()
+
+        # Una figura puo' stare in un solo canvas: si riusa la cache solo se
+        # nessun'altra finestra storico la sta mostrando
+        cached = self._history_figures
+        prev_window = self._history_figures_window
+        in_use = prev_window is not None and prev_window.winfo_exists()
+        if (cached is not None and cached[0] is sessions and cached[1] == threshold
+                and not in_use):
+            for item in cached[2]:
+                results.put(item)
+            results.put(None)
+            self._history_figures_window = hist_window
+        else:
+            # Le figure matplotlib (senza canvas) si costruiscono in un thread di
+            # lavoro; canvas Tk e draw() restano nel main thread
+            threading.Thread(
+                target=self._render_history_figures,
+                args=(sessions, analysis[0], threshold, results, not in_use),
+                daemon=True,
+            ).start()
+            if not in_use:
+                self._history_figures_window = hist_window
+        # Canvas e draw() solo al primo passaggio su ciascun tab
+        pending: dict[str, object] = {}
+        notebook.bind("<<NotebookTabChanged>>",
+                      lambda e: self._on_history_tab_changed(notebook, pending))
+        self.root.after(50, self._drain_history_queue, hist_window, notebook, loading,
+                        results, analysis, pending)
+
+    def _render_history_figures(self, sessions: list[dict], durations: np.ndarray,
+                                threshold_ms: float, results: queue.Queue,
+                                store: bool = True) -> None:
+        """Costruisce le figure dello storico (thread di lavoro).
+
+        Accoda (chiave tab, figura) nell'ordine dei tab e None alla fine.
+        Se store e' True e non ci sono errori, le figure vanno in cache
+        per le aperture successive con le stesse sessioni e soglia.
+        """
+        viz = self.history_viz
+        builders = (
+            ("tab_progress", lambda: viz.plot_progress(sessions)),
+            ("tab_distribution", lambda: viz.plot_distribution(sessions)),
+            ("tab_diagnostics", lambda: viz.plot_diagnostics(sessions)),
+            ("tab_detail", lambda: viz.plot_session_detail(durations, threshold_ms)),
+        )
+        figures = []
+        try:
+            for tab_key, build in builders:
+                fig = build()
+                if fig:
+                    figures.append((tab_key, fig))
+                    results.put((tab_key, fig))
+            if store:
+                self._history_figures = (sessions, threshold_ms, figures)
+        except Exception as e:
+            logger.error("Errore creazione grafici storici: %s", e)
+        finally:
+            results.put(None)
+
+    def _drain_history_queue(self, hist_window: tk.Toplevel, notebook: ttk.Notebook,
+                             loading: ttk.Label, results: queue.Queue,
+                             analysis: tuple, pending: dict[str, object]) -> None:
+        """Aggiunge al notebook i tab delle figure pronte; a fine coda il report.
+
+        Le figure restano in pending finche' il relativo tab non viene
+        selezionato (vedi _on_history_tab_changed).
+        """
+        if not hist_window.winfo_exists():
+            return
 
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-        # Tab Progressi
-        fig_progress = self.history_viz.plot_progress(sessions)
-        if fig_progress:
-            tab1 = ttk.Frame(notebook)
-            notebook.add(tab1, text=self._t("tab_progress"))
-            canvas1 = FigureCanvasTkAgg(fig_progress, master=tab1)
-            canvas1.get_tk_widget().pack(fill="both", expand=True)
-            canvas1.draw()
-
-        # Tab Distribuzione
-        fig_dist = self.history_viz.plot_distribution(sessions)
-        if fig_dist:
-            tab2 = ttk.Frame(notebook)
-            notebook.add(tab2, text=self._t("tab_distribution"))
-            canvas2 = FigureCanvasTkAgg(fig_dist, master=tab2)
-            canvas2.get_tk_widget().pack(fill="both", expand=True)
-            canvas2.draw()
-
-        # Tab Diagnostica
-        fig_diag = self.history_viz.plot_diagnostics(sessions)
-        if fig_diag:
-            tab3 = ttk.Frame(notebook)
-            notebook.add(tab3, text=self._t("tab_diagnostics"))
-            canvas3 = FigureCanvasTkAgg(fig_diag, master=tab3)
-            canvas3.get_tk_widget().pack(fill="both", expand=True)
-            canvas3.draw()
-
-        # Tab Analisi pressioni (dalla sessione corrente se disponibile)
-        durations = [s.get("avg_duration_ms", 0) for s in sessions]
-        if durations:
-            fig_detail = self.history_viz.plot_session_detail(
-                durations, self.monitor.threshold_ms
-            )
-            if fig_detail:
-                tab4 = ttk.Frame(notebook)
-                notebook.add(tab4, text=self._t("tab_detail"))
-                canvas4 = FigureCanvasTkAgg(fig_detail, master=tab4)
-                canvas4.get_tk_widget().pack(fill="both", expand=True)
-                canvas4.draw()
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                self._on_history_tab_changed(notebook, pending)
+                self.root.after(50, self._drain_history_queue, hist_window, notebook,
+                                loading, results, analysis, pending)
+                return
+
+            if item is None:
+                break
+            tab_key, fig = item
+            tab = ttk.Frame(notebook)
+            notebook.add(tab, text=self._t(tab_key))
+            pending[str(tab)] = fig
+
+        loading.destroy()
+        self._on_history_tab_changed(notebook, pending)
 
         # Tab Report
+        _, report, conn_report, press_analysis = analysis
         tab_report = ttk.Frame(notebook, padding=15)
         notebook.add(tab_report, text=self._t("tab_report"))
-        self._build_report_tab(tab_report, sessions)
+        self._build_report_tab(tab_report, report, conn_report, press_analysis)
+
+    def _on_history_tab_changed(self, notebook: ttk.Notebook,
+                                pending: dict[str, object]) -> None:
+        """Crea canvas e draw() della figura del tab selezionato, una sola volta."""
+        try:
+            tab_name = notebook.select()
+        except tk.TclError:
+            return
+        fig = pending.pop(str(tab_name), None)
+        if fig is None:
+            return
+        canvas = FigureCanvasTkAgg(fig, master=notebook.nametowidget(tab_name))
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        canvas.draw()
+
+    def _history_analysis(self, sessions: list[dict]) -> tuple:
+        """Durate e report dello storico, ricalcolati solo se le sessioni cambiano.
+
+        Il DataManager restituisce la stessa lista finche' il CSV non cambia:
+        l'identita' della lista basta come chiave della cache.
 
-    def _build_report_tab(self, parent: ttk.Frame, sessions: list[dict]) -> None:
-        """Costruisce il tab report comparativo."""
-        report = self.diagnostics.compare_sessions(sessions)
-        conn_report = self.diagnostics.get_connection_comparison(sessions)
+        Returns:
+            (durate medie per sessione, report comparativo, confronto
+            connessioni, analisi pressioni)
+        """
+        cache = self._history_cache
+        if cache is not None and cache[0] is sessions:
+            return cache[1:]
+
+        # Durate medie per sessione, estratte una volta sola per grafico e report
+        durations = np.fromiter(
+            (s.get("avg_duration_ms", 0.0) for s in sessions),
+            dtype=np.float64,
+            count=len(sessions),
+        )
+        result = (
+            durations,
+            self.diagnostics.compare_sessions(sessions),
+            self.diagnostics.get_connection_comparison(sessions),
+            self.diagnostics.analyze_press_durations(durations),
+        )
+        self._history_cache = (sessions, *result)
+        return result
 
-        # Analisi pressioni se ci sono durate
-        durations = [s.get("avg_duration_ms", 0) for s in sessions]
-        press_analysis = self.diagnostics.analyze_press_durations(durations)
+    def _build_report_tab(self, parent: ttk.Frame, report: dict, conn_report: dict,
+                          press_analysis: dict) -> None:
+        """Costruisce il tab report comparativo.
 
+        Args:
+            parent: frame del tab
+            report: risultato di compare_sessions
+            conn_report: risultato di get_connection_comparison
+            press_analysis: analisi delle durate medie per sessione
+        """
         text = tk.Text(parent, wrap="word", font=("Consolas", 10),
                        bg=self._colors["sfondo"], fg=self._colors["testo"],
                        insertbackground=self._colors["testo"])
         text.pack(fill="both", expand=True)
 
-        dur = report.get("durata_pressione", {})
-        lat = report.get("latenza", {})
-        jit = report.get("jitter", {})
-
-        lines = [
-            self._t("report_total_sessions", count=report.get('sessioni_totali', 0)),
-            "",
-            self._t("report_press_duration"),
-            self._t("report_best_min", value=dur.get('best_min_ms', 0)),
-            self._t("report_avg_sessions", value=dur.get('media_avg_ms', 0)),
-            self._t("report_trend", value=dur.get('trend', '-')),
-            "",
-            self._t("report_statistical"),
-            self._t("report_median", value=press_analysis.get('mediana_ms', 0)),
-            self._t("report_percentile_10", value=press_analysis.get('percentile_10', 0)),
-            self._t("report_percentile_90", value=press_analysis.get('percentile_90', 0)),
-            self._t("report_std_dev", value=press_analysis.get('std_dev_ms', 0)),
-            "",
-            self._t("report_latency"),
-            self._t("report_avg", value=lat.get('media_ms', 0)),
-            self._t("report_best", value=lat.get('migliore_ms', 0)),
-            "",
-            self._t("report_jitter"),
-            self._t("report_avg_jitter", value=jit.get('medio_ms', 0)),
-            "",
-            self._t("report_connection"),
-        ]
+        sources = {
+            "dur": report.get("durata_pressione", {}),
+            "lat": report.get("latenza", {}),
+            "jit": report.get("jitter", {}),
+            "press": press_analysis,
+        }
+
+        t = self._t
+        lines = [t("report_total_sessions", count=report.get('sessioni_totali', 0))]
+        for row in self.REPORT_LINES:
+            if row is None:
+                lines.append("")
+                continue
+            key, source, field, default, spec = row
+            if source is None:
+                lines.append(t(key))
+            else:
+                value = sources[source].get(field, default)
+                lines.append(t(key, value=format(value, spec)))
 
         for conn_type in ["USB", "Bluetooth"]:
             data = conn_report.get(conn_type, {})
             lines.append(f"  {conn_type}:")
-            lines.append(self._t("report_conn_sessions", value=data.get('sessioni', 0)))
-            lines.append(self._t("report_conn_latency", value=data.get('latenza_media_ms', 0)))
-            lines.append(self._t("report_conn_best", value=data.get('best_min_press_ms', 0)))
+            for key, field, spec in self.REPORT_CONN_LINES:
+                lines.append(t(key, value=format(data.get(field, 0), spec)))
 
         text.insert("1.0", "\n".join(lines))
         text.config(state="disabled")
@@ -629,18 +905,43 @@ class App:
         self.data_manager.select_profile(name)
 
     def _on_new_profile(self) -> None:
-        """Crea un nuovo profilo utente."""
-        dialog = tk.Toplevel(self.root)
+        """Crea un nuovo profilo utente.
+
+        Il dialog viene costruito alla prima apertura e poi solo nascosto
+        (withdraw) e rimostrato, invece di ricreare Toplevel e widget.
+        """
+        if self._new_profile_dialog is None:
+            self._build_new_profile_dialog()
+        dialog, label, entry, button = self._new_profile_dialog
+
+        # La lingua puo' essere cambiata dall'ultima apertura
         dialog.title(self._t("new_profile"))
+        label.config(text=self._t("profile_name"))
+        button.config(text=self._t("create"))
+        entry.delete(0, "end")
+
+        dialog.deiconify()
+        # Layout calcolato una volta prima del grab, senza un update() completo
+        dialog.update_idletasks()
+        dialog.grab_set()
+        entry.focus()
+
+    def _build_new_profile_dialog(self) -> None:
+        """Costruisce (nascosto) il dialog per il nuovo profilo."""
+        dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.geometry("300x120")
         dialog.configure(bg=self._colors["sfondo"])
         dialog.transient(self.root)
-        dialog.grab_set()
 
-        ttk.Label(dialog, text=self._t("profile_name")).pack(pady=(15, 5))
+        label = ttk.Label(dialog)
+        label.pack(pady=(15, 5))
         entry = ttk.Entry(dialog, width=25)
         entry.pack(pady=5)
-        entry.focus()
+
+        def close():
+            dialog.grab_release()
+            dialog.withdraw()
 
         def create():
             name = entry.get().strip()
@@ -651,16 +952,21 @@ class App:
                     self.data_manager.select_profile(name)
                 else:
                     messagebox.showwarning(self._t("error"), self._t("profile_exists", name=name))
-            dialog.destroy()
+            close()
 
-        ttk.Button(dialog, text=self._t("create"), command=create).pack(pady=10)
+        button = ttk.Button(dialog, command=create)
+        button.pack(pady=10)
         entry.bind("<Return>", lambda _: create())
+        dialog.protocol("WM_DELETE_WINDOW", close)
+
+        self._new_profile_dialog = (dialog, label, entry, button)
 
     def _on_threshold_change(self) -> None:
         """Aggiorna la soglia durata."""
         try:
             value = self._var_threshold.get()
             self.monitor.set_threshold(value)
+            self._threshold_ms = self.monitor.threshold_ms
             self._chart.set_threshold(value)
         except (tk.TclError, ValueError):
             pass
@@ -668,14 +974,16 @@ class App:
     def _on_button_change(self, _event=None) -> None:
         selected = self._combo_button.get()
         # Gestisce sia "Tutti" che "All" (traduzione)
-        if selected in ["Tutti", "All"]:
+        if selected in _ALL_BUTTON_ALIASES:
             self.monitor.set_monitored_button(None)
         else:
             self.monitor.set_monitored_button(selected)
 
     def _refresh_profile_list(self) -> None:
-        profiles = self.data_manager.get_profiles()
-        self._combo_profile["values"] = profiles
+        profiles = tuple(self.data_manager.get_profiles())
+        if profiles != self._profiles_cache:
+            self._combo_profile["values"] = profiles
+            self._profiles_cache = profiles
         if profiles:
             current = self.data_manager.current_profile or profiles[0]
             if current in profiles:
@@ -686,85 +994,180 @@ class App:
     # --- Loop aggiornamento UI ---
 
     def _schedule_update(self) -> None:
+        """Programma il prossimo aggiornamento di timer e diagnostica."""
         if not self._session_active:
             return
-        interval = self.settings.get("intervallo_aggiornamento_ms", 50)
-        self._update_job = self.root.after(interval, self._update_ui)
+        self._update_job = self.root.after(self._update_interval_ms, self._update_diagnostics)
 
-    def _update_ui(self) -> None:
-        """Aggiorna tutti gli elementi UI con i dati correnti."""
+    def _schedule_press_drain(self) -> None:
+        """Programma il prossimo svuotamento della coda pressioni."""
         if not self._session_active:
             return
+        self._press_job = self.root.after(self._refresh_ms, self._drain_presses)
 
-        stats = self.monitor.stats
+    def _drain_presses(self) -> None:
+        """Tick a ritmo grafico_refresh_ms: porta in UI le pressioni accodate."""
+        if not self._session_active:
+            return
+        self._update_presses()
+        self._schedule_press_drain()
+
+    def _on_root_map(self, event) -> None:
+        """Finestra di nuovo visibile: riallinea subito grafico, log e label."""
+        if event.widget is not self.root or self._root_visible:
+            return
+        self._root_visible = True
+        if self._session_active:
+            self._update_presses()
+            self._refresh_diagnostics()
+
+    def _on_root_unmap(self, event) -> None:
+        """Finestra iconificata o nascosta: sospende i ridisegni."""
+        if event.widget is self.root:
+            self._root_visible = False
+
+    def _update_presses(self) -> None:
+        """Svuota la coda pressioni e aggiorna grafico, log e statistiche."""
+        # Con la finestra nascosta le pressioni restano in coda: il deque e'
+        # limitato e quelle scartate non sarebbero comunque piu' visibili
+        # (grafico e log mostrano solo le ultime). Le statistiche stanno nel
+        # monitor e si rileggono al <Map>
+        if not self._root_visible:
+            return
+        # Processa pressioni accodate dal thread monitor: len() fissa quante
+        # toglierne in una passata; quelle accodate nel frattempo restano
+        # per il prossimo tick
+        pending = self._pending_presses
+        count = len(pending)
+        if not count:
+            return
+        popleft = pending.popleft
+        new_presses = [popleft() for _ in range(count)]
 
-        # Processa pressioni accodate dal thread monitor
-        with self._pending_lock:
-            new_presses = list(self._pending_presses)
-            self._pending_presses.clear()
+        # Grafico e log in blocco: un solo ridisegno per gruppo di pressioni
+        self._chart.add_presses([p.duration_ms for p in new_presses])
+        self._append_log_batch(new_presses)
 
-        for press in new_presses:
-            # Aggiorna grafico
-            self._chart.add_press(press.duration_ms, press.button)
-            # Aggiorna log
-            self._append_log(press)
+        stats = self.monitor.stats
+        total = stats.total_presses
+        set_label = self._set_label
 
         # Durata ultima pressione (grande, colorata)
         if stats.last_duration_ms > 0:
             d = stats.last_duration_ms
-            self._lbl_duration.config(text=f"{d:.1f}")
-            if d <= self.monitor.threshold_ms:
-                self._lbl_duration.config(style="Green.TLabel")
-            else:
-                self._lbl_duration.config(style="Red.TLabel")
-
-        # Statistiche
-        self._lbl_total.config(text=str(stats.total_presses))
-
-        if stats.total_presses > 0:
-            min_d = stats.min_duration_ms if stats.min_duration_ms != float("inf") else 0
-            self._lbl_min.config(text=f"{min_d:.1f} ms")
-            self._lbl_avg.config(text=f"{self.monitor.get_avg_duration():.1f} ms")
-            self._lbl_max.config(text=f"{stats.max_duration_ms:.1f} ms")
-            self._lbl_successes.config(
-                text=f"{stats.threshold_successes} / {stats.total_presses}"
-            )
+            set_label(self._var_duration, f"{d:.1f}")
+            style = self.DURATION_STYLES[d <= self._threshold_ms]
+            # Cambia stile solo quando la durata passa dall'altro lato della soglia
+            if style != self._duration_style:
+                self._lbl_duration.config(style=style)
+                self._duration_style = style
+
+        # Statistiche: niente formattazione se nessun valore e' cambiato.
+        # Sono lette dal vivo, quindi un drain successivo puo' trovarle
+        # gia' mostrate da quello precedente
+        snap = (total, stats.min_duration_ms, stats.max_duration_ms,
+                stats.avg_duration_ms, stats.threshold_successes)
+        if snap == self._last_stats_snapshot:
+            return
+        self._last_stats_snapshot = snap
+        # Si formattano i valori gia' letti nello snapshot, senza rileggere stats
+        _, min_d, max_d, avg_d, successes = snap
+
+        set_label(self._var_total, str(total))
+
+        if total > 0:
+            if min_d == _INF:
+                min_d = 0
+            set_label(self._var_min, f"{min_d:.1f} ms")
+            set_label(self._var_avg, f"{avg_d:.1f} ms")
+            set_label(self._var_max, f"{max_d:.1f} ms")
+            set_label(self._var_successes, f"{successes} / {total}")
+
+    def _update_diagnostics(self) -> None:
+        """Aggiorna timer sessione e diagnostica (timer lento, non per pressione)."""
+        if not self._session_active:
+            return
 
-        # Timer sessione
-        duration = self.monitor.get_session_duration()
-        minutes = int(duration) // 60
-        seconds = int(duration) % 60
-        self._lbl_session_time.config(text=f"{minutes:02d}:{seconds:02d}")
+        if self._root_visible:
+            self._refresh_diagnostics()
 
-        # Diagnostica (dal vero polling rate del thread input)
-        polling = self.monitor.get_polling_rate()
-        latency_stats = self.monitor.get_latency_stats()
-        quality = self.diagnostics.evaluate_connection(polling, latency_stats)
+        self._schedule_update()
 
-        self._lbl_polling.config(text=f"{polling:.0f} Hz")
-        self._lbl_latency.config(text=f"{latency_stats['avg']:.1f} ms")
-        self._lbl_jitter.config(text=f"{latency_stats['jitter']:.1f} ms")
-        self._lbl_quality.config(text=quality)
+    def _refresh_diagnostics(self) -> None:
+        """Scrive nelle label timer sessione, polling, latenza e qualita'."""
+        set_label = self._set_label
 
-        self._schedule_update()
+        # Timer sessione: il testo cambia al massimo una volta al secondo
+        duration = int(self.monitor.get_session_duration())
+        if duration != self._last_session_second:
+            self._last_session_second = duration
+            set_label(self._var_session_time, f"{duration // 60:02d}:{duration % 60:02d}")
 
-    def _append_log(self, press: PressEvent) -> None:
-        """Aggiunge una riga al log pressioni."""
-        self._log_text.config(state="normal")
+        # Diagnostica (dal vero polling rate del thread input): senza nuovi
+        # poll il monitor restituisce lo stesso dict e non c'e' nulla da riscrivere
+        latency_stats = self.monitor.get_latency_stats()
+        if latency_stats is self._last_latency_stats:
+            return
+        self._last_latency_stats = latency_stats
+        polling = self.monitor.get_polling_rate()
+        quality = self.diagnostics.evaluate_connection(polling, latency_stats)
 
-        d = press.duration_ms
-        tag = "good" if d <= self.monitor.threshold_ms else "bad"
-        line = f"{press.button:>5s}  {d:7.1f} ms\n"
+        set_banded = self._set_banded
+        set_banded(self._var_polling, polling, self.POLLING_BAND_HZ, "{:.0f} Hz")
+        set_banded(self._var_latency, latency_stats['avg'], self.LATENCY_BAND_MS, "{:.1f} ms")
+        set_banded(self._var_jitter, latency_stats['jitter'], self.LATENCY_BAND_MS, "{:.1f} ms")
+        set_label(self._var_quality, quality)
 
-        self._log_text.insert("end", line, tag)
+    def _set_label(self, var: tk.StringVar, text: str) -> None:
+        """Imposta il testo di una label (via la sua StringVar) solo se e' cambiato."""
+        # Le Variable tkinter non sono hashabili: la chiave e' il nome Tcl
+        name = str(var)
+        if self._last_label_text.get(name) != text:
+            var.set(text)
+            self._last_label_text[name] = text
 
-        # Limita righe visibili
-        line_count = int(self._log_text.index("end-1c").split(".")[0])
-        if line_count > 100:
-            self._log_text.delete("1.0", "2.0")
+    def _set_banded(self, var: tk.StringVar, value: float, band: float, fmt: str) -> None:
+        """Aggiorna una label numerica solo se il valore esce dalla banda di isteresi.
 
-        self._log_text.see("end")
-        self._log_text.config(state="disabled")
+        Args:
+            var: StringVar della label
+            value: nuovo valore
+            band: scostamento minimo dall'ultimo valore mostrato
+            fmt: formato del testo (str.format con un argomento)
+        """
+        name = str(var)
+        last = self._last_label_value.get(name)
+        if last is not None and abs(value - last) < band:
+            return
+        self._last_label_value[name] = value
+        self._set_label(var, fmt.format(value))
+
+    def _append_log_batch(self, presses: list[PressEvent]) -> None:
+        """Aggiunge al log pressioni una riga per ogni pressione, in un'unica insert."""
+        # Righe che verrebbero subito eliminate dal limite: non si formattano
+        presses = presses[-self.LOG_MAX_LINES:]
+        threshold = self._threshold_ms
+        # insert() accetta coppie testo, tag ripetute: una sola chiamata Tcl.
+        # Le righe consecutive con lo stesso tag diventano un unico testo
+        chunks = []
+        tags = self.LOG_TAGS
+        for tag, run in groupby(presses, key=lambda p: tags[p.duration_ms <= threshold]):
+            chunks.append("".join([f"{p.button:>5s}  {p.duration_ms:7.1f} ms\n" for p in run]))
+            chunks.append(tag)
+
+        log = self._log_text
+        log.config(state="normal")
+        log.insert("end", *chunks)
+
+        # Limita righe visibili, eliminando l'eccesso in un colpo solo
+        self._log_line_count += len(presses)
+        excess = self._log_line_count - self.LOG_MAX_LINES
+        if excess > 0:
+            log.delete("1.0", f"{excess + 1}.0")
+            self._log_line_count = self.LOG_MAX_LINES
+
+        log.see("end")
+        log.config(state="disabled")
 
     def _on_close(self) -> None:
         """Gestisce la chiusura dell'applicazione."""
@@ -772,6 +1175,9 @@ class App:
             self.monitor.stop()
         if self._update_job:
             self.root.after_cancel(self._update_job)
+        if self._press_job:
+            self.root.after_cancel(self._press_job)
+        self.data_manager.close()
         self.root.destroy()
 
     def run(self) -> None:
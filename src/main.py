@@ -3,6 +3,7 @@
 Configura logging, verifica dipendenze e avvia la GUI.
 """
 
+import importlib.util
 import logging
 import os
 import sys
@@ -42,27 +43,12 @@ def check_dependencies() -> bool:
     Returns:
         True se tutte le dipendenze sono presenti
     """
-    missing = []
-
-    try:
-        import matplotlib
-    except ImportError:
-        missing.append("matplotlib")
-
-    try:
-        import numpy
-    except ImportError:
-        missing.append("numpy")
-
-    try:
-        import inputs
-    except ImportError:
-        missing.append("inputs")
-
-    try:
-        import tkinter
-    except ImportError:
-        missing.append("tkinter")
+    # find_spec verifica solo la presenza del modulo senza eseguirlo: gli
+    # import veri (matplotlib, backend Tk) avvengono una volta sola, con la GUI
+    missing = [
+        name for name in ("matplotlib", "numpy", "inputs", "tkinter")
+        if importlib.util.find_spec(name) is None
+    ]
 
     if missing:
         print(f"ERRORE: Dipendenze mancanti: {', '.join(missing)}")
@@ -84,6 +84,7 @@ TRANSLATIONS = {
         "tab_diagnostics": "Diagnostics",
         "tab_detail": "Duration details",
         "tab_report": "Report",
+        "history_loading": "Loading charts...",
 
         # Chart
         "threshold_label": "Threshold:",
@@ -191,6 +192,7 @@ TRANSLATIONS = {
         "tab_diagnostics": "Diagnostica",
         "tab_detail": "Dettaglio durate",
         "tab_report": "Report",
+        "history_loading": "Caricamento grafici...",
 
         # Chart
         "threshold_label": "Soglia:",
@@ -220,6 +222,18 @@ TRANSLATIONS = {
     }
 }
 
+# Tabella piatta (lingua, chiave) -> testo, con il fallback inglese gia' risolto:
+# get_text fa una sola lookup invece di due per chiamata
+_TEXTS: dict[tuple[str, str], str] = {
+    (lang, key): texts.get(key, TRANSLATIONS["en"].get(key))
+    for lang, texts in TRANSLATIONS.items()
+    for key in TRANSLATIONS["en"].keys() | texts.keys()
+}
+
+# Codice mostrato sul selettore e lingua successiva per ogni lingua
+_FLAGS = {"en": "EN", "it": "IT"}
+_NEXT_LANGUAGE = {"en": "it", "it": "en"}
+
 
 def get_text(key: str, lang: str = "en", **kwargs) -> str:
     """Ottiene il testo tradotto per la chiave specificata.
@@ -232,12 +246,13 @@ def get_text(key: str, lang: str = "en", **kwargs) -> str:
     Returns:
         Testo tradotto
     """
-    if lang not in TRANSLATIONS:
-        lang = "en"
+    # Lingua sconosciuta o chiave mancante: si ricade sull'inglese, poi sulla chiave
+    text = _TEXTS.get((lang, key))
+    if text is None:
+        text = _TEXTS.get(("en", key), key)
 
-    text = TRANSLATIONS[lang].get(key, TRANSLATIONS["en"].get(key, key))
-
-    if kwargs:
+    # Testi senza segnaposto: niente format() anche se arrivano parametri
+    if kwargs and "{" in text:
         try:
             return text.format(**kwargs)
         except (KeyError, ValueError):
@@ -255,11 +270,7 @@ def get_flag_emoji(lang: str) -> str:
     Returns:
         Codice lingua da visualizzare
     """
-    flags = {
-        "en": "EN",
-        "it": "IT"
-    }
-    return flags.get(lang, "EN")
+    return _FLAGS.get(lang, "EN")
 
 
 def get_next_language(current_lang: str) -> str:
@@ -271,4 +282,4 @@ def get_next_language(current_lang: str) -> str:
     Returns:
         Prossima lingua
     """
-    return "it" if current_lang == "en" else "en"
+    return _NEXT_LANGUAGE.get(current_lang, "en")
@@ -5,17 +5,51 @@ di progressi, distribuzione durate e diagnostica.
 """
 
 import logging
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Optional
 
-import matplotlib
-matplotlib.use("TkAgg")
-
-import matplotlib.pyplot as plt
+import numpy as np
+# Nessun matplotlib.use(): senza pyplot il backend globale non serve. Il
+# grafico real-time usa esplicitamente il canvas Tk; le figure dello storico
+# sono Figure semplici (canvas di base, disegnabili in Agg) e ricevono il
+# canvas Tk solo quando vengono mostrate
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class ColorTheme:
+    """Palette dei grafici, risolta una volta dal dict "colori" dei settings."""
+    bg: str = "#2c3e50"
+    text: str = "#ecf0f1"
+    line: str = "#3498db"
+    threshold: str = "#e67e22"
+    good: str = "#2ecc71"
+    bad: str = "#e74c3c"
+
+    @classmethod
+    def from_colors(cls, colors: Optional[dict] = None) -> "ColorTheme":
+        """Costruisce il tema dal dict colori (chiavi mancanti: default).
+
+        Args:
+            colors: dict con chiavi sfondo, testo, grafico_linea,
+                grafico_soglia, sopra_soglia, sotto_soglia
+        """
+        colors = colors or {}
+        default = cls()
+        return cls(
+            bg=colors.get("sfondo", default.bg),
+            text=colors.get("testo", default.text),
+            line=colors.get("grafico_linea", default.line),
+            threshold=colors.get("grafico_soglia", default.threshold),
+            good=colors.get("sopra_soglia", default.good),
+            bad=colors.get("sotto_soglia", default.bad),
+        )
+
+
 class RealtimeChart:
     """Grafico real-time delle durate pressioni, embedded in tkinter.
 
@@ -32,6 +66,7 @@ class RealtimeChart:
         threshold_label: str = "Threshold:",
         x_axis_label: str = "Press #",
         y_axis_label: str = "Duration (ms)",
+        refresh_ms: int = 16,
     ):
         """Inizializza il grafico real-time.
 
@@ -43,142 +78,234 @@ class RealtimeChart:
             threshold_label: label tradotta per la soglia
             x_axis_label: label tradotta per l'asse X
             y_axis_label: label tradotta per l'asse Y
+            refresh_ms: intervallo minimo tra due ridisegni (16 ~ 60 Hz)
         """
         self.max_bars = max_bars
+        self.refresh_ms = refresh_ms
         self.threshold_ms = threshold_ms
         self.threshold_label = threshold_label
         self.x_axis_label = x_axis_label
         self.y_axis_label = y_axis_label
 
-        colors = colors or {}
-        self._color_threshold = colors.get("grafico_soglia", "#e67e22")
-        self._color_bg = colors.get("sfondo", "#2c3e50")
-        self._color_text = colors.get("testo", "#ecf0f1")
-        self._color_above = colors.get("sopra_soglia", "#2ecc71")
-        self._color_below = colors.get("sotto_soglia", "#e74c3c")
-
-        # Dati: lista di (durata_ms, button_name)
-        self._data: list[tuple[float, str]] = []
+        self._theme = ColorTheme.from_colors(colors)
+
+        # Durate delle ultime max_bars pressioni (il pulsante non serve al grafico)
+        self._durations: deque[float] = deque(maxlen=max_bars)
+        # Ridisegno gia' programmato con after_idle e non ancora eseguito
+        self._redraw_pending = False
+        # Istante dell'ultimo ridisegno (perf_counter), per il limite refresh_ms
+        self._last_redraw = 0.0
+        # Assi, etichette o legenda cambiati: serve un draw completo con tight_layout
+        self._layout_dirty = False
+        # Sfondo dell'asse senza gli artisti animati, copiato ad ogni draw completo
+        self._background = None
+        # Canvas mappato; da nascosto i ridisegni si rinviano al <Map>
+        self._visible = True
+        self._redraw_on_map = False
+        # Limite Y disegnato: se cambia lo sfondo non e' piu' valido
+        self._drawn_ylim: Optional[float] = None
 
         # Crea figura matplotlib
-        self._fig = Figure(figsize=(6, 2.8), dpi=100, facecolor=self._color_bg)
+        self._fig = Figure(figsize=(6, 2.8), dpi=100, facecolor=self._theme.bg)
         self._ax = self._fig.add_subplot(111)
         self._setup_axes()
-
-        # Linea soglia
+        # Asse X fisso su max_bars posizioni, tick compresi: cambia solo il limite Y
+        self._ax.set_xlim(-0.6, max_bars - 0.4)
+        self._ax.set_xticks(range(0, max_bars, max(1, max_bars // 10)))
+
+        # Artisti persistenti, aggiornati sul posto ad ogni ridisegno: una barra
+        # e un'etichetta per posizione, linea soglia e legenda
+        self._bars = self._ax.bar(range(max_bars), [0] * max_bars, width=0.8, alpha=0.85)
+        self._bar_labels = [
+            self._ax.text(i, 0, "", ha="center", va="bottom",
+                          fontsize=7, color=self._theme.text, alpha=0.8)
+            for i in range(max_bars)
+        ]
         self._threshold_line = self._ax.axhline(
-            y=self.threshold_ms, color=self._color_threshold,
+            y=self.threshold_ms, color=self._theme.threshold,
             linestyle="--", linewidth=1.5, alpha=0.9,
-            label=f"{self.threshold_label} {self.threshold_ms:.0f} ms"
+            label=self._threshold_text()
         )
-        self._ax.legend(loc="upper right", fontsize=8,
-                        facecolor=self._color_bg, edgecolor=self._color_text,
-                        labelcolor=self._color_text)
+        self._legend = self._ax.legend(loc="upper right", fontsize=8,
+                                       facecolor=self._theme.bg, edgecolor=self._theme.text,
+                                       labelcolor=self._theme.text)
+        # Animati: esclusi dal draw completo (sfondo) e disegnati sopra, in quest'ordine
+        self._animated = [*self._bars.patches, self._threshold_line,
+                          *self._bar_labels, self._legend]
+        for artist in self._animated:
+            artist.set_animated(True)
+        self._update_artists()
 
         # Embed in tkinter
         self._canvas = FigureCanvasTkAgg(self._fig, master=parent_frame)
-        self._canvas.get_tk_widget().pack(fill="both", expand=True)
+        widget = self._canvas.get_tk_widget()
+        widget.pack(fill="both", expand=True)
+        widget.bind("<Map>", self._on_map, add="+")
+        widget.bind("<Unmap>", self._on_unmap, add="+")
+        self._canvas.mpl_connect("draw_event", self._on_draw)
+        self._canvas.mpl_connect("resize_event", self._on_resize)
 
         self._fig.tight_layout(pad=1.0)
 
     def _setup_axes(self) -> None:
         """Configura stile degli assi."""
-        self._ax.set_facecolor(self._color_bg)
-        self._ax.set_xlabel(self.x_axis_label, color=self._color_text, fontsize=9)
-        self._ax.set_ylabel(self.y_axis_label, color=self._color_text, fontsize=9)
-        self._ax.tick_params(colors=self._color_text, labelsize=8)
-        for spine in self._ax.spines.values():
-            spine.set_color(self._color_text)
+        ax, t = self._ax, self._theme
+        ax.set_facecolor(t.bg)
+        ax.set_xlabel(self.x_axis_label, color=t.text, fontsize=9)
+        ax.set_ylabel(self.y_axis_label, color=t.text, fontsize=9)
+        ax.tick_params(colors=t.text, labelsize=8)
+        for spine in ax.spines.values():
+            spine.set_color(t.text)
             spine.set_alpha(0.3)
-        self._ax.grid(True, axis="y", alpha=0.15, color=self._color_text)
+        ax.grid(True, axis="y", alpha=0.15, color=t.text)
+
+    def _threshold_text(self) -> str:
+        """Testo della linea soglia in legenda."""
+        return f"{self.threshold_label} {self.threshold_ms:.0f} ms"
 
     def reset(self) -> None:
         """Resetta il grafico per una nuova sessione."""
-        self._data.clear()
-        self._ax.clear()
-        self._setup_axes()
-        self._threshold_line = self._ax.axhline(
-            y=self.threshold_ms, color=self._color_threshold,
-            linestyle="--", linewidth=1.5, alpha=0.9,
-            label=f"{self.threshold_label} {self.threshold_ms:.0f} ms"
-        )
-        self._ax.legend(loc="upper right", fontsize=8,
-                        facecolor=self._color_bg, edgecolor=self._color_text,
-                        labelcolor=self._color_text)
-        self._canvas.draw_idle()
+        self._durations.clear()
+        self._schedule_redraw()
 
     def add_press(self, duration_ms: float, button: str) -> None:
         """Aggiunge una pressione e ridisegna.
 
         Args:
             duration_ms: durata della pressione in ms
-            button: nome del pulsante
+            button: nome del pulsante (non mostrato)
         """
-        self._data.append((duration_ms, button))
+        self._durations.append(duration_ms)
+        self._schedule_redraw()
 
-        # Limita il numero di barre visibili
-        if len(self._data) > self.max_bars:
-            self._data = self._data[-self.max_bars:]
+    def add_presses(self, durations_ms: list[float]) -> None:
+        """Aggiunge piu' pressioni con un solo ridisegno.
 
-        self._redraw()
+        Args:
+            durations_ms: durate delle pressioni in ms
+        """
+        if not durations_ms:
+            return
+        # Il deque scarta da solo le barre piu' vecchie oltre max_bars
+        self._durations.extend(durations_ms)
+        self._schedule_redraw()
 
-    def _redraw(self) -> None:
-        """Ridisegna tutte le barre."""
-        self._ax.clear()
-        self._setup_axes()
+    def _schedule_redraw(self) -> None:
+        """Programma un ridisegno, al massimo uno ogni refresh_ms.
 
-        if not self._data:
-            self._canvas.draw_idle()
+        Piu' richieste prima del ridisegno (raffiche di pressioni, cambio
+        lingua con soglia e assi) producono un solo ridisegno; con input
+        piu' rapido del refresh i dati si accumulano nel deque.
+        """
+        if self._redraw_pending:
             return
-
-        durations = [d[0] for d in self._data]
+        self._redraw_pending = True
+        widget = self._canvas.get_tk_widget()
+        wait_ms = self.refresh_ms - (time.perf_counter() - self._last_redraw) * 1000.0
+        if wait_ms <= 0:
+            widget.after_idle(self._redraw)
+        else:
+            widget.after(int(wait_ms) + 1, self._redraw)
+
+    def _update_artists(self) -> bool:
+        """Aggiorna sul posto barre, etichette, soglia e limiti degli assi.
+
+        Returns:
+            True se il limite Y e' cambiato (serve un draw completo)
+        """
+        durations = self._durations
         n = len(durations)
-        x = list(range(n))
-
-        # Colori: verde se sotto soglia, rosso se sopra
-        colors = [
-            self._color_above if d <= self.threshold_ms else self._color_below
-            for d in durations
-        ]
-
-        self._ax.bar(x, durations, color=colors, alpha=0.85, width=0.8)
-
-        # Linea soglia
-        self._ax.axhline(
-            y=self.threshold_ms, color=self._color_threshold,
-            linestyle="--", linewidth=1.5, alpha=0.9,
-            label=f"{self.threshold_label} {self.threshold_ms:.0f} ms"
-        )
-
+        threshold = self.threshold_ms
+        good, bad = self._theme.good, self._theme.bad
+        top = max(durations) if durations else 0.0
         # Etichette durata sulle barre (solo se poche)
-        if n <= 25:
-            for i, d in enumerate(durations):
-                self._ax.text(
-                    i, d + max(durations) * 0.02, f"{d:.0f}",
-                    ha="center", va="bottom",
-                    fontsize=7, color=self._color_text, alpha=0.8
-                )
-
-        # Limiti Y dinamici
-        y_max = max(max(durations) * 1.3, self.threshold_ms * 2)
+        show_labels = n <= 25
+        offset = top * 0.02
+
+        patches, labels = self._bars.patches, self._bar_labels
+        for i, (rect, label, d) in enumerate(zip(patches, labels, durations)):
+            rect.set_visible(True)
+            rect.set_height(d)
+            # Colori: verde se sotto soglia, rosso se sopra
+            rect.set_color(good if d <= threshold else bad)
+            if show_labels:
+                label.set_position((i, d + offset))
+                label.set_text(f"{d:.0f}")
+            else:
+                label.set_text("")
+        # Posizioni libere: anche a altezza 0 il bordo resterebbe visibile
+        for rect, label in zip(patches[n:], labels[n:]):
+            rect.set_visible(False)
+            label.set_text("")
+
+        self._threshold_line.set_ydata([threshold, threshold])
+
+        # Limiti Y dinamici: cambiano lo sfondo, quindi solo se diversi
+        y_max = max(top * 1.3, threshold * 2)
+        if y_max == self._drawn_ylim:
+            return False
         self._ax.set_ylim(0, y_max)
+        self._drawn_ylim = y_max
+        return True
 
-        self._ax.set_xticks(x[::max(1, n // 10)])
+    def _redraw(self) -> None:
+        """Ridisegna le barre: blit sullo sfondo salvato, o draw completo se serve."""
+        self._redraw_pending = False
+        if not self._visible:
+            self._redraw_on_map = True
+            return
+        self._last_redraw = time.perf_counter()
+        full = self._update_artists() or self._layout_dirty or self._background is None
 
-        self._ax.legend(loc="upper right", fontsize=8,
-                        facecolor=self._color_bg, edgecolor=self._color_text,
-                        labelcolor=self._color_text)
+        try:
+            if full:
+                if self._layout_dirty:
+                    self._fig.tight_layout(pad=1.0)
+                    self._layout_dirty = False
+                # Sfondo di nuovo valido solo dopo il draw (vedi _on_draw)
+                self._background = None
+                self._canvas.draw_idle()
+                return
+            self._canvas.restore_region(self._background)
+            self._draw_animated()
+            self._canvas.blit(self._ax.bbox)
+        except Exception:
+            pass
 
+    def _on_unmap(self, _event) -> None:
+        """Canvas nascosto (finestra iconificata): sospende i ridisegni."""
+        self._visible = False
+
+    def _on_map(self, _event) -> None:
+        """Canvas di nuovo visibile: recupera i ridisegni saltati con un draw completo."""
+        self._visible = True
+        if self._redraw_on_map:
+            self._redraw_on_map = False
+            self._background = None
+            self._schedule_redraw()
+
+    def _draw_animated(self) -> None:
+        """Disegna gli artisti animati sul renderer corrente."""
+        draw_artist = self._ax.draw_artist
+        for artist in self._animated:
+            draw_artist(artist)
+
+    def _on_draw(self, _event) -> None:
+        """Dopo ogni draw completo: salva lo sfondo e aggiunge gli artisti animati."""
+        self._background = self._canvas.copy_from_bbox(self._ax.bbox)
+        self._draw_animated()
+
+    def _on_resize(self, _event) -> None:
+        """Ricalcola il layout al ridimensionamento (il backend poi ridisegna)."""
         try:
             self._fig.tight_layout(pad=1.0)
-            self._canvas.draw_idle()
         except Exception:
             pass
 
     def set_threshold(self, value_ms: float) -> None:
         """Aggiorna la soglia visualizzata."""
         self.threshold_ms = value_ms
-        self._redraw()
+        self._set_legend_text()
 
     def set_threshold_label(self, threshold_label: str) -> None:
         """Aggiorna la label della soglia (per cambio lingua).
@@ -187,7 +314,15 @@ class RealtimeChart:
             threshold_label: nuova label tradotta
         """
         self.threshold_label = threshold_label
-        self._redraw()
+        self._set_legend_text()
+
+    def _set_legend_text(self) -> None:
+        """Aggiorna il testo soglia in linea e legenda e programma un draw completo."""
+        text = self._threshold_text()
+        self._threshold_line.set_label(text)
+        self._legend.get_texts()[0].set_text(text)
+        self._layout_dirty = True
+        self._schedule_redraw()
 
     def set_axis_labels(self, x_axis_label: str, y_axis_label: str) -> None:
         """Aggiorna le label degli assi (per cambio lingua).
@@ -198,7 +333,10 @@ class RealtimeChart:
         """
         self.x_axis_label = x_axis_label
         self.y_axis_label = y_axis_label
-        self._redraw()
+        self._ax.set_xlabel(x_axis_label)
+        self._ax.set_ylabel(y_axis_label)
+        self._layout_dirty = True
+        self._schedule_redraw()
 
     def get_figure(self) -> Figure:
         """Restituisce la figura matplotlib."""
@@ -208,23 +346,64 @@ class RealtimeChart:
 class HistoryVisualizer:
     """Genera grafici statici per lo storico sessioni (basati su durata)."""
 
+    # Colonne estratte dalle sessioni: nome -> (campo CSV, default)
+    _COLUMNS = {
+        "mins": ("min_duration_ms", 0),
+        "avgs": ("avg_duration_ms", 0),
+        "successes": ("threshold_successes", 0),
+        "totals": ("press_count", 1),
+        "latencies": ("latency_avg_ms", 0),
+        "jitters": ("jitter_ms", 0),
+    }
+
     def __init__(self, colors: Optional[dict] = None):
-        colors = colors or {}
-        self._color_bg = colors.get("sfondo", "#2c3e50")
-        self._color_text = colors.get("testo", "#ecf0f1")
-        self._color_line = colors.get("grafico_linea", "#3498db")
-        self._color_threshold = colors.get("grafico_soglia", "#e67e22")
-        self._color_good = colors.get("sopra_soglia", "#2ecc71")
-        self._color_bad = colors.get("sotto_soglia", "#e74c3c")
+        self._theme = ColorTheme.from_colors(colors)
+        # (lista sessioni, colonne estratte): riusato dai grafici della stessa lista
+        self._columns_cache: Optional[tuple[list, dict]] = None
+
+    def _extract(self, sessions: list[dict]) -> dict:
+        """Estrae le colonne numeriche delle sessioni come array NumPy.
+
+        Il risultato e' in cache per l'ultima lista (per identita'): i grafici
+        di una stessa apertura dello storico la attraversano una volta sola.
+
+        Args:
+            sessions: lista di dict sessioni dal DataManager
+
+        Returns:
+            dict con array float64 (mins, avgs, successes, totals, latencies,
+            jitters, pcts) e indices (1..n)
+        """
+        cached = self._columns_cache
+        if cached is not None and cached[0] is sessions:
+            return cached[1]
+
+        n = len(sessions)
+        columns = {
+            name: np.fromiter((s.get(field, default) for s in sessions),
+                              dtype=np.float64, count=n)
+            for name, (field, default) in self._COLUMNS.items()
+        }
+        columns["indices"] = np.arange(1, n + 1)
+
+        # % pressioni sotto soglia per sessione (0 se nessuna pressione)
+        totals = columns["totals"]
+        pcts = np.zeros(n)
+        np.divide(columns["successes"], totals, out=pcts, where=totals > 0)
+        columns["pcts"] = np.round(pcts * 100.0, 1)
+
+        self._columns_cache = (sessions, columns)
+        return columns
 
     def _style_ax(self, ax) -> None:
         """Applica lo stile standard a un asse."""
-        ax.set_facecolor(self._color_bg)
-        ax.tick_params(colors=self._color_text, labelsize=8)
+        t = self._theme
+        ax.set_facecolor(t.bg)
+        ax.tick_params(colors=t.text, labelsize=8)
         for spine in ax.spines.values():
-            spine.set_color(self._color_text)
+            spine.set_color(t.text)
             spine.set_alpha(0.3)
-        ax.grid(True, alpha=0.15, color=self._color_text)
+        ax.grid(True, alpha=0.15, color=t.text)
 
     def plot_progress(self, sessions: list[dict]) -> Optional[Figure]:
         """Grafico progressi: durata min e media per sessione.
@@ -235,37 +414,33 @@ class HistoryVisualizer:
         if len(sessions) < 2:
             return None
 
-        fig, (ax1, ax2) = plt.subplots(
-            2, 1, figsize=(8, 6), facecolor=self._color_bg
-        )
+        fig = Figure(figsize=(8, 6), facecolor=self._theme.bg)
+        ax1, ax2 = fig.subplots(2, 1)
 
-        indices = list(range(1, len(sessions) + 1))
-        min_durs = [s.get("min_duration_ms", 0) for s in sessions]
-        avg_durs = [s.get("avg_duration_ms", 0) for s in sessions]
+        columns = self._extract(sessions)
+        indices = columns["indices"]
+        min_durs = columns["mins"]
+        avg_durs = columns["avgs"]
 
         # Grafico durate
         self._style_ax(ax1)
-        ax1.plot(indices, min_durs, "o-", color=self._color_good,
+        ax1.plot(indices, min_durs, "o-", color=self._theme.good,
                  linewidth=2, markersize=5, label="Min (best)")
-        ax1.plot(indices, avg_durs, "s-", color=self._color_line,
+        ax1.plot(indices, avg_durs, "s-", color=self._theme.line,
                  linewidth=1.5, markersize=4, label="Media")
-        ax1.set_ylabel("Durata (ms)", color=self._color_text, fontsize=10)
+        ax1.set_ylabel("Durata (ms)", color=self._theme.text, fontsize=10)
         ax1.set_title("Progressi durata pressioni",
-                      color=self._color_text, fontsize=12)
-        ax1.legend(facecolor=self._color_bg, edgecolor=self._color_text,
-                   labelcolor=self._color_text)
+                      color=self._theme.text, fontsize=12)
+        ax1.legend(facecolor=self._theme.bg, edgecolor=self._theme.text,
+                   labelcolor=self._theme.text)
         # Per le durate, piu' basso e' meglio: inverti concettualmente
         ax1.invert_yaxis()
 
         # Grafico successi soglia
-        successes = [s.get("threshold_successes", 0) for s in sessions]
-        totals = [s.get("press_count", 1) for s in sessions]
-        pcts = [round(s / t * 100, 1) if t > 0 else 0 for s, t in zip(successes, totals)]
-
         self._style_ax(ax2)
-        ax2.bar(indices, pcts, color=self._color_good, alpha=0.7)
-        ax2.set_xlabel("Sessione #", color=self._color_text, fontsize=10)
-        ax2.set_ylabel("% sotto soglia", color=self._color_text, fontsize=10)
+        ax2.bar(indices, columns["pcts"], color=self._theme.good, alpha=0.7)
+        ax2.set_xlabel("Sessione #", color=self._theme.text, fontsize=10)
+        ax2.set_ylabel("% sotto soglia", color=self._theme.text, fontsize=10)
         ax2.set_ylim(0, 105)
 
         fig.tight_layout(pad=1.5)
@@ -276,18 +451,19 @@ class HistoryVisualizer:
         if not sessions:
             return None
 
-        avg_durs = [s.get("avg_duration_ms", 0) for s in sessions]
+        avg_durs = self._extract(sessions)["avgs"]
 
-        fig, ax = plt.subplots(figsize=(7, 4), facecolor=self._color_bg)
+        fig = Figure(figsize=(7, 4), facecolor=self._theme.bg)
+        ax = fig.subplots()
         self._style_ax(ax)
 
         n_bins = min(20, max(5, len(avg_durs) // 2))
-        ax.hist(avg_durs, bins=n_bins, color=self._color_line,
-                alpha=0.7, edgecolor=self._color_text, linewidth=0.5)
-        ax.set_xlabel("Durata media pressione (ms)", color=self._color_text, fontsize=10)
-        ax.set_ylabel("Frequenza", color=self._color_text, fontsize=10)
+        ax.hist(avg_durs, bins=n_bins, color=self._theme.line,
+                alpha=0.7, edgecolor=self._theme.text, linewidth=0.5)
+        ax.set_xlabel("Durata media pressione (ms)", color=self._theme.text, fontsize=10)
+        ax.set_ylabel("Frequenza", color=self._theme.text, fontsize=10)
         ax.set_title("Distribuzione durate sessioni",
-                     color=self._color_text, fontsize=12)
+                     color=self._theme.text, fontsize=12)
 
         fig.tight_layout(pad=1.5)
         return fig
@@ -297,66 +473,63 @@ class HistoryVisualizer:
         if len(sessions) < 2:
             return None
 
-        fig, (ax1, ax2) = plt.subplots(
-            2, 1, figsize=(8, 6), facecolor=self._color_bg
-        )
+        fig = Figure(figsize=(8, 6), facecolor=self._theme.bg)
+        ax1, ax2 = fig.subplots(2, 1)
 
-        indices = list(range(1, len(sessions) + 1))
-        latencies = [s.get("latency_avg_ms", 0) for s in sessions]
-        jitters = [s.get("jitter_ms", 0) for s in sessions]
+        columns = self._extract(sessions)
+        indices = columns["indices"]
+        latencies = columns["latencies"]
+        jitters = columns["jitters"]
 
         self._style_ax(ax1)
-        ax1.plot(indices, latencies, "o-", color=self._color_threshold,
+        ax1.plot(indices, latencies, "o-", color=self._theme.threshold,
                  linewidth=2, markersize=5)
-        ax1.set_ylabel("Latenza media (ms)", color=self._color_text, fontsize=10)
+        ax1.set_ylabel("Latenza media (ms)", color=self._theme.text, fontsize=10)
         ax1.set_title("Latenza e Jitter nel tempo",
-                      color=self._color_text, fontsize=12)
+                      color=self._theme.text, fontsize=12)
 
         self._style_ax(ax2)
-        ax2.plot(indices, jitters, "s-", color=self._color_bad,
+        ax2.plot(indices, jitters, "s-", color=self._theme.bad,
                  linewidth=2, markersize=5)
-        ax2.set_xlabel("Sessione #", color=self._color_text, fontsize=10)
-        ax2.set_ylabel("Jitter (ms)", color=self._color_text, fontsize=10)
+        ax2.set_xlabel("Sessione #", color=self._theme.text, fontsize=10)
+        ax2.set_ylabel("Jitter (ms)", color=self._theme.text, fontsize=10)
 
         fig.tight_layout(pad=1.5)
         return fig
 
-    def plot_session_detail(self, durations_ms: list[float], threshold_ms: float) -> Optional[Figure]:
+    def plot_session_detail(self, durations_ms, threshold_ms: float) -> Optional[Figure]:
         """Grafico dettaglio singola sessione: ogni pressione come barra.
 
         Args:
-            durations_ms: lista durate della sessione
+            durations_ms: durate della sessione (lista o array NumPy)
             threshold_ms: soglia corrente
         """
-        if not durations_ms:
+        durations_ms = np.asarray(durations_ms, dtype=np.float64)
+        if durations_ms.size == 0:
             return None
 
-        fig, (ax1, ax2) = plt.subplots(
-            2, 1, figsize=(8, 6), facecolor=self._color_bg
-        )
+        fig = Figure(figsize=(8, 6), facecolor=self._theme.bg)
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Barre per ogni pressione
         self._style_ax(ax1)
-        x = list(range(1, len(durations_ms) + 1))
-        colors = [
-            self._color_good if d <= threshold_ms else self._color_bad
-            for d in durations_ms
-        ]
+        x = np.arange(1, durations_ms.size + 1)
+        colors = np.where(durations_ms <= threshold_ms, self._theme.good, self._theme.bad)
         ax1.bar(x, durations_ms, color=colors, alpha=0.8, width=0.9)
-        ax1.axhline(y=threshold_ms, color=self._color_threshold,
+        ax1.axhline(y=threshold_ms, color=self._theme.threshold,
                      linestyle="--", linewidth=1.5, alpha=0.9)
-        ax1.set_ylabel("Durata (ms)", color=self._color_text, fontsize=10)
-        ax1.set_title("Durata ogni pressione", color=self._color_text, fontsize=12)
+        ax1.set_ylabel("Durata (ms)", color=self._theme.text, fontsize=10)
+        ax1.set_title("Durata ogni pressione", color=self._theme.text, fontsize=12)
 
         # Istogramma distribuzione
         self._style_ax(ax2)
-        n_bins = min(30, max(5, len(durations_ms) // 3))
-        ax2.hist(durations_ms, bins=n_bins, color=self._color_line,
-                 alpha=0.7, edgecolor=self._color_text, linewidth=0.5)
-        ax2.axvline(x=threshold_ms, color=self._color_threshold,
+        n_bins = min(30, max(5, durations_ms.size // 3))
+        ax2.hist(durations_ms, bins=n_bins, color=self._theme.line,
+                 alpha=0.7, edgecolor=self._theme.text, linewidth=0.5)
+        ax2.axvline(x=threshold_ms, color=self._theme.threshold,
                      linestyle="--", linewidth=1.5, alpha=0.9)
-        ax2.set_xlabel("Durata (ms)", color=self._color_text, fontsize=10)
-        ax2.set_ylabel("Frequenza", color=self._color_text, fontsize=10)
+        ax2.set_xlabel("Durata (ms)", color=self._theme.text, fontsize=10)
+        ax2.set_ylabel("Frequenza", color=self._theme.text, fontsize=10)
 
         fig.tight_layout(pad=1.5)
         return fig